@@ -1,8 +1,16 @@
 import os # Imports the 'os' module to interact with the operating system,
            # such as checking if a file exists and creating files.
+import bisect
+import csv
+import json
+import mmap
+import sys
+from array import array
 
 class Book:
     """Represents a Book with title, author, and ISBN."""
+    __slots__ = ("title", "author", "isbn")  # No per-book __dict__ for large catalogues
+
     def __init__(self, title, author, isbn):
         self.title = title
         self.author = author
@@ -13,36 +21,82 @@ class Book:
         return f"{self.title}, {self.author}, {self.isbn}"
 
 
+# Marker written in place of a title to record that an ISBN was removed.
+TOMBSTONE = "#removed"
+
+# Length of the character n-grams used to index titles and authors.
+GRAM_SIZE = 3
+
+# Number of imported books written (and synced to disk) at a time.
+BATCH_SIZE = 10000
+
+# Suffix of the file next to the library file that persists the n-gram index.
+GRAMS_SUFFIX = ".grams"
+
+# Books indexed at startup beyond the saved n-gram index before it is saved again.
+GRAMS_SAVE_LINES = 1000
+
+
 class Library:
     """Handles library operations: adding, removing, and searching books."""
     def __init__(self, filename="books_details.txt"):
         self.filename = filename
+        self._index = {}  # Maps each ISBN to the byte offsets of its live lines
+        self._live_lines = 0  # Lines that still hold a book
+        self._dead_lines = 0  # Removed books and tombstones awaiting compaction
+        # The n-gram index maps each title/author n-gram to the byte offsets of the
+        # lines containing it, in file order. Offsets saved in the GRAMS_SUFFIX file
+        # are read through a memory map; only lines indexed since are held in arrays.
+        self._grams = {}  # N-gram -> array of offsets indexed since the last save
+        self._saved_grams = {}  # N-gram -> (start, count) of its offsets in _saved_offsets
+        self._saved_offsets = memoryview(array("Q"))
+        self._grams_map = None
 
         # Create the file if it doesn't exist
         if not os.path.exists(filename):
             open(filename, "w").close()
+        self._build_index()
 
     def add_book(self, book):
-        """Adds a new book to the library file."""
-        with open(self.filename, "a") as file:
-            file.write(str(book) + "\n")
+        """Appends a new book to the library file and indexes it."""
+        if not storable(book):
+            print("\nFields must be non-empty, without ', ', line breaks or surrounding spaces.")
+            return
+        with open(self.filename, "ab") as file:
+            offset = file.tell()
+            file.write(f"{book}\n".encode())
+        self._index.setdefault(book.isbn, []).append(offset)
+        self._live_lines += 1
+        self._index_grams(book.title, book.author, offset)
         print(f"\n'{book.title}' has been added to the library.")
 
     def remove_book(self, isbn):
-        """Removes a book by its ISBN from the library."""
-        books = self._load_books()
-        updated_books = [b for b in books if b.isbn != isbn]
-
-        if len(books) == len(updated_books):
+        """Removes a book by its ISBN by appending a tombstone to the file."""
+        offsets = self._index.pop(isbn, None)
+        if offsets is None:
             print(f"\nNo book found with ISBN {isbn}.")
-        else:
-            self._save_books(updated_books)
-            print(f"\nBook with ISBN {isbn} has been removed.")
+            return
+
+        with open(self.filename, "ab") as file:
+            file.write(f"{TOMBSTONE}, {isbn}\n".encode())
+        self._live_lines -= len(offsets)
+        self._dead_lines += len(offsets) + 1
+        print(f"\nBook with ISBN {isbn} has been removed.")
+
+        # Rewrite the file once removed lines outnumber the live ones
+        if self._dead_lines > self._live_lines:
+            self.compact()
+
+    def find_book(self, isbn):
+        """Returns the book stored under an ISBN, or None if there is none."""
+        offsets = self._index.get(isbn)
+        if not offsets:
+            return None
+        return self._read_books(offsets[:1])[0]
 
     def search_book(self, keyword):
         """Searches for books based on a keyword in title or author."""
-        books = self._load_books()
-        found_books = [b for b in books if keyword.lower() in b.title.lower() or keyword.lower() in b.author.lower()]
+        found_books = self._find_books(keyword)
 
         if found_books:
             print(f"\nBooks matching '{keyword}':")
@@ -51,20 +105,281 @@ class Library:
         else:
             print(f"\nNo books found for keyword '{keyword}'.")
 
-    def _load_books(self):
-        """Loads all books from the file."""
+    def import_books(self, filename):
+        """Streams books from a CSV or JSON Lines file, skipping ISBNs already stored.
+
+        Rows that are malformed or hold fields the library file cannot store are
+        skipped and counted. Books are indexed only once their batch is on disk,
+        so an error part way through leaves the index matching the file.
+        """
+        added = skipped = invalid = 0
+        batch = {}  # Books read but not yet written, by ISBN
+        with open(self.filename, "ab") as file:
+            for book in read_book_feed(filename):
+                if book is None or not storable(book):
+                    invalid += 1
+                elif book.isbn in self._index or book.isbn in batch:
+                    skipped += 1
+                else:
+                    batch[book.isbn] = book
+                    added += 1
+                    if len(batch) >= BATCH_SIZE:
+                        self._write_batch(file, batch)
+            self._write_batch(file, batch)
+        if added:
+            self._save_grams()
+        print(f"\nImported {added} books ({skipped} duplicate ISBNs and {invalid} invalid rows skipped).")
+
+    def export_books(self, filename):
+        """Streams every live book to a CSV or JSON Lines file."""
+        count = 0
+        with open(filename, "w", newline="") as file:
+            if filename.endswith(".jsonl"):
+                for book in self._iter_books():
+                    file.write(json.dumps({"title": book.title, "author": book.author, "isbn": book.isbn}) + "\n")
+                    count += 1
+            else:
+                writer = csv.writer(file)
+                writer.writerow(["title", "author", "isbn"])  # Header
+                for book in self._iter_books():
+                    writer.writerow([book.title, book.author, book.isbn])
+                    count += 1
+        print(f"\nExported {count} books to {filename}.")
+
+    def compact(self):
+        """Rewrites the file with only the live books, dropping tombstones."""
+        self._save_books(self._load_books())
+        # Offsets all move, so drop the saved n-gram index and build it again
+        self._close_grams()
+        if os.path.exists(self.filename + GRAMS_SUFFIX):
+            os.remove(self.filename + GRAMS_SUFFIX)
+        self._build_index()
+
+    def _find_books(self, keyword):
+        """Returns the books whose title or author contains the keyword."""
+        keyword = keyword.lower()
+        if len(keyword) < GRAM_SIZE:
+            # Too short to use the n-gram index, so check every book
+            candidates = self._iter_books()
+        else:
+            # Only lines containing every n-gram of the keyword can match; walk the
+            # rarest n-gram's offsets and look each one up in the others
+            grams = self._split_grams(keyword)
+            rarest = min(grams, key=self._posting_size)
+            others = grams - {rarest}
+            offsets = [offset for offset in self._iter_posting(rarest)
+                       if all(self._in_posting(gram, offset) for gram in others)]
+            # Skip lines of removed books, which stay indexed until compaction
+            candidates = [book for offset, book in zip(offsets, self._read_books(offsets))
+                          if offset in self._index.get(book.isbn, ())]
+        return [b for b in candidates if keyword in b.title.lower() or keyword in b.author.lower()]
+
+    def _index_grams(self, title, author, offset):
+        """Adds the n-grams of the book at a line offset to the search index."""
+        for gram in self._split_grams(title.lower()) | self._split_grams(author.lower()):
+            posting = self._grams.get(gram)
+            if posting is None:
+                posting = self._grams[gram] = array("Q")
+            posting.append(offset)
+
+    def _posting_size(self, gram):
+        """Returns how many lines contain an n-gram."""
+        return self._saved_grams.get(gram, (0, 0))[1] + len(self._grams.get(gram, ()))
+
+    def _iter_posting(self, gram):
+        """Yields the offsets of the lines containing an n-gram, in file order."""
+        start, count = self._saved_grams.get(gram, (0, 0))
+        for i in range(start, start + count):
+            yield self._saved_offsets[i]
+        yield from self._grams.get(gram, ())  # Indexed after the save, so further into the file
+
+    def _in_posting(self, gram, offset):
+        """Checks whether the line at an offset contains an n-gram, by binary search."""
+        start, count = self._saved_grams.get(gram, (0, 0))
+        i = bisect.bisect_left(self._saved_offsets, offset, start, start + count)
+        if i < start + count and self._saved_offsets[i] == offset:
+            return True
+        posting = self._grams.get(gram, ())
+        i = bisect.bisect_left(posting, offset)
+        return i < len(posting) and posting[i] == offset
+
+    def _open_grams(self):
+        """Memory-maps the saved n-gram index; returns the file size it covers (0 if it is missing or stale)."""
+        self._close_grams()
+        try:
+            file = open(self.filename + GRAMS_SUFFIX, "rb")
+        except FileNotFoundError:
+            return 0
+        with file:
+            header = json.loads(file.readline())
+            stat = os.stat(self.filename)
+            # Compaction replaces the library file (new inode); appends only make it longer
+            if header["inode"] != stat.st_ino or header["size"] > stat.st_size:
+                return 0
+            data_start = file.tell()
+            self._grams_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._saved_offsets = memoryview(self._grams_map)[data_start:].cast("Q")
+        start = 0
+        for gram, count in zip(header["grams"], header["counts"]):
+            self._saved_grams[gram] = (start, count)
+            start += count
+        return header["size"]
+
+    def _close_grams(self):
+        """Forgets the saved n-gram index and releases its memory map."""
+        self._saved_offsets.release()
+        self._saved_offsets = memoryview(array("Q"))
+        self._saved_grams = {}
+        if self._grams_map is not None:
+            self._grams_map.close()
+            self._grams_map = None
+
+    def _save_grams(self):
+        """Writes the whole n-gram index next to the library file, so the next start can map it."""
+        grams = sorted(self._saved_grams.keys() | self._grams.keys())
+        stat = os.stat(self.filename)  # Every line in the file is indexed at this point
+        header = json.dumps({"inode": stat.st_ino, "size": stat.st_size, "grams": grams,
+                             "counts": [self._posting_size(gram) for gram in grams]})
+        header += " " * (-(len(header) + 1) % 8)  # Align the offsets that follow to 8 bytes
+        temp_filename = self.filename + GRAMS_SUFFIX + ".tmp"
+        with open(temp_filename, "wb") as file:
+            file.write(f"{header}\n".encode())
+            for gram in grams:
+                start, count = self._saved_grams.get(gram, (0, 0))
+                with self._saved_offsets[start:start + count] as saved:
+                    file.write(saved)
+                file.write(self._grams.get(gram, array("Q")))
+        self._close_grams()  # The map has to be closed before its file can be replaced on Windows
+        os.replace(temp_filename, self.filename + GRAMS_SUFFIX)
+        self._grams = {}
+        self._open_grams()
+
+    def _split_grams(self, text):
+        """Returns the set of n-grams in a lowercased string."""
+        return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+    def _write_batch(self, file, batch):
+        """Writes a batch of books, syncs it to disk, then indexes the books and empties the batch."""
+        if not batch:
+            return
+        lines = [f"{book}\n".encode() for book in batch.values()]
+        offset = file.tell()
+        file.write(b"".join(lines))
+        file.flush()
+        os.fsync(file.fileno())
+
+        for book, line in zip(batch.values(), lines):
+            self._index[book.isbn] = [offset]
+            self._live_lines += 1
+            self._index_grams(book.title, book.author, offset)
+            offset += len(line)
+        batch.clear()
+
+    def _read_books(self, offsets):
+        """Reads the books stored at the given byte offsets."""
         books = []
-        with open(self.filename, 'r') as file:
-            for line in file:
-                title, author, isbn = line.strip().split(", ")
-                books.append(Book(title, author, isbn))
+        with open(self.filename, "rb") as file:
+            for offset in offsets:
+                file.seek(offset)
+                books.append(Book(*self._parse_line(file.readline())))
         return books
 
+    def _build_index(self):
+        """Scans the file once to index the offset of every live book and the n-grams of new lines.
+
+        Lines covered by the saved n-gram index are not n-gram indexed again. Lines
+        of removed books stay in the n-gram index and are filtered out at search
+        time; compaction replaces the file, which makes the whole index rebuild.
+        """
+        self._index = {}
+        self._grams = {}
+        self._live_lines = 0
+        self._dead_lines = 0
+        covered = self._open_grams()
+        indexed = 0
+        offset = 0
+        with open(self.filename, "rb") as file:
+            for line in file:
+                fields = self._parse_line(line)
+                if fields and fields[0] == TOMBSTONE:
+                    # A tombstone removes every earlier line with that ISBN
+                    removed = self._index.pop(fields[-1], [])
+                    self._live_lines -= len(removed)
+                    self._dead_lines += len(removed) + 1
+                elif fields:
+                    title, author, isbn = fields
+                    self._index.setdefault(isbn, []).append(offset)
+                    self._live_lines += 1
+                    if offset >= covered:
+                        self._index_grams(title, author, offset)
+                        indexed += 1
+                offset += len(line)
+        if indexed >= GRAMS_SAVE_LINES:
+            self._save_grams()
+
+    def _parse_line(self, line):
+        """Splits a raw line from the file into its fields."""
+        line = line.decode().strip()
+        return line.split(", ") if line else None
+
+    def _iter_books(self):
+        """Yields the live books in file order, reading only their lines through a memory map."""
+        live_offsets = sorted(offset for offsets in self._index.values() for offset in offsets)
+        if not live_offsets:
+            return  # An empty file cannot be memory-mapped
+        with open(self.filename, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for offset in live_offsets:
+                end = data.find(b"\n", offset)
+                title, author, isbn = self._parse_line(data[offset:end if end != -1 else len(data)])
+                yield Book(title, sys.intern(author), isbn)  # Share one string per author
+
+    def _load_books(self):
+        """Loads all live books from the file."""
+        return list(self._iter_books())
+
     def _save_books(self, books):
-        """Saves the list of books to the file."""
-        with open(self.filename, "w") as file:
+        """Saves the list of books to the file, replacing it in one step."""
+        temp_filename = self.filename + ".tmp"
+        with open(temp_filename, "w") as file:
             for book in books:
                 file.write(f"{book}\n")
+        os.replace(temp_filename, self.filename)
+
+
+def storable(book):
+    """Checks that a book's fields can be written as one ', '-separated line and read back unchanged."""
+    return book.title != TOMBSTONE and all(
+        field and field == field.strip() and ", " not in field and "\n" not in field and "\r" not in field
+        for field in (book.title, book.author, book.isbn))
+
+
+def read_book_feed(filename):
+    """Yields books from a CSV file (with a title,author,isbn header) or a JSON Lines file.
+
+    Yields None in place of a row that is not valid JSON or is missing a field.
+    """
+    with open(filename, "r", newline="") as file:
+        if filename.endswith(".jsonl"):
+            for line in file:
+                if line.strip():
+                    try:
+                        yield book_from_record(json.loads(line))
+                    except json.JSONDecodeError:
+                        yield None
+        else:
+            for row in csv.DictReader(file):
+                yield book_from_record(row)
+
+
+def book_from_record(record):
+    """Builds a book from a feed record, or returns None if a field is missing."""
+    try:
+        fields = [record["title"], record["author"], record["isbn"]]
+    except (KeyError, TypeError):  # Missing column, or a JSON value that is not an object
+        return None
+    if any(field is None for field in fields):  # Short CSV row
+        return None
+    return Book(*(str(field) for field in fields))
 
 
 def get_book_details():
@@ -85,7 +400,9 @@ def main():
         print("2. Remove Book")
         print("3. Search Book")
         print("4. View All Books")
-        print("5. Exit")
+        print("5. Import Books from File")
+        print("6. Export Books to File")
+        print("7. Exit")
         choice = input("Enter your choice: ")
 
         if choice == '1':
@@ -104,16 +421,34 @@ def main():
             library.search_book(keyword)
 
         elif choice == '4':
-            # Display all books
-            books = library._load_books()
-            if books:
+            # Display all books, streaming them instead of loading the whole file
+            books = library._iter_books()
+            first_book = next(books, None)
+            if first_book:
                 print("\n--- List of Books ---")
+                print(first_book)
                 for book in books:
                     print(book)
             else:
                 print("\nNo books available in the library.")
 
         elif choice == '5':
+            # Bulk import books from a CSV or JSON Lines file
+            filename = input("Enter the file to import (.csv or .jsonl): ")
+            try:
+                library.import_books(filename)
+            except FileNotFoundError:
+                print(f"\nFile '{filename}' not found.")
+            except (csv.Error, UnicodeDecodeError) as error:
+                # Batches written before the error stay imported
+                print(f"\nCould not read '{filename}': {error}")
+
+        elif choice == '6':
+            # Export all books to a CSV or JSON Lines file
+            filename = input("Enter the file to export to (.csv or .jsonl): ")
+            library.export_books(filename)
+
+        elif choice == '7':
             # Exit the program
             print("Exiting... Goodbye!")
             break
@@ -1,4 +1,18 @@
+import bisect  # Import the bisect module to keep the name index sorted.
+import itertools  # Import the itertools module to put a header before the snapshot records.
 import json  # Import the json module to work with JSON files.
+import os  # Import the os module for atomic file replacement.
+import statistics  # Import the statistics module for class-wide percentiles.
+
+# Subjects graded for every student, in the order their grades are entered.
+SUBJECTS = ["Python Programming", "Theory of Programming", "NLP", "Prolog", "Maths"]
+
+PASS_MARK = 60  # Minimum average (or subject grade) needed to pass.
+
+# File used by the menu. A ".jsonl" name switches to JSON Lines storage with a change journal.
+STUDENTS_FILE = "students.json"
+
+MAX_MATCHES = 20  # Most students listed when a name search matches several.
 
 class Student:
     """A class to represent a student with attributes and methods to manage grades."""
@@ -13,6 +27,14 @@ class Student:
         self.name = name
         self.id = student_id
         self.grades = []  # Stores the grades of the student.
+        self.cohort = None  # Cohort to notify when a grade is added.
+
+        # Running totals, updated on every new grade so statistics are O(1).
+        self.grade_count = 0
+        self.grade_total = 0
+        self.grade_squares = 0
+        self.min_grade = None
+        self.max_grade = None
 
     def add_grade(self, grade):
         """
@@ -21,25 +43,64 @@ class Student:
             grade (int): Grade between 0 and 100.
         """
         if 0 <= grade <= 100:  # Check if the grade is within a valid range.
+            was_passing = self.has_passed()
             self.grades.append(grade)
+            self._record_grade(grade)
+            if self.cohort is not None:
+                self.cohort.grade_added(self, grade, was_passing)
         else:
             print("Invalid grade! Must be between 0 and 100.")
 
+    def set_grades(self, grades):
+        """
+        Replace all of the student's grades and rebuild the running totals.
+        Args:
+            grades (list): Grades between 0 and 100.
+        """
+        self.grades = list(grades)
+        self.grade_count = self.grade_total = self.grade_squares = 0
+        self.min_grade = self.max_grade = None
+        for grade in self.grades:
+            self._record_grade(grade)
+
+    def _record_grade(self, grade):
+        """
+        Fold a single grade into the running totals.
+        Args:
+            grade (int): Grade between 0 and 100.
+        """
+        self.grade_count += 1
+        self.grade_total += grade
+        self.grade_squares += grade * grade
+        self.min_grade = grade if self.min_grade is None else min(self.min_grade, grade)
+        self.max_grade = grade if self.max_grade is None else max(self.max_grade, grade)
+
     def calculate_average(self):
         """
         Calculate the average of the student's grades.
         Returns:
             float: Average grade or 0 if there are no grades.
         """
-        return sum(self.grades) / len(self.grades) if self.grades else 0
+        return self.grade_total / self.grade_count if self.grade_count else 0
+
+    def calculate_variance(self):
+        """
+        Calculate the population variance of the student's grades.
+        Returns:
+            float: Variance of the grades or 0 if there are no grades.
+        """
+        if not self.grade_count:
+            return 0
+        # Integer arithmetic keeps the result exact for whole-number grades.
+        return (self.grade_count * self.grade_squares - self.grade_total ** 2) / self.grade_count ** 2
 
     def has_passed(self):
         """
-        Determine if the student has passed (average >= 60).
+        Determine if the student has passed (average >= PASS_MARK).
         Returns:
             bool: True if passed, False otherwise.
         """
-        return self.calculate_average() >= 60
+        return self.calculate_average() >= PASS_MARK
 
     def to_dict(self):
         """
@@ -49,19 +110,284 @@ class Student:
         """
         return {"name": self.name, "id": self.id, "grades": self.grades}
 
-def save_students_to_file(students, filename="students.json"):
+class Cohort:
+    """A group of students with running totals over all of their grades."""
+
+    def __init__(self, students=None):
+        """
+        Initialize the cohort and add any given students to it.
+        Args:
+            students (list): Optional list of Student objects.
+        """
+        self.students = []
+        self.grade_count = 0
+        self.grade_total = 0
+        self.passed_count = 0  # Number of students whose average is at least PASS_MARK.
+        self.journal = None  # JSON Lines file whose journal records every change, if any.
+        self.generation = 0  # Generation of that file's snapshot, stamped on every journal record.
+        self._snapshot_version = None  # (inode, mtime) of the snapshot the generation was read from.
+        self.by_id = {}  # Maps each student ID to its student.
+        self._names = []  # Sorted (lowercase name, position in students) pairs for prefix search.
+        for student in students or []:
+            self._add(student)
+        # Sort the name index once instead of inserting each loaded student into it.
+        self._names = sorted((student.name.lower(), position) for position, student in enumerate(self.students))
+
+    def add_student(self, student):
+        """
+        Add a student to the cohort and fold their grades into the totals.
+        Args:
+            student (Student): The student to add.
+        """
+        bisect.insort(self._names, (student.name.lower(), len(self.students)))
+        self._add(student)
+        if self.journal:
+            self._append_to_journal({"student": student.to_dict()})
+
+    def _add(self, student):
+        """
+        Register a student and fold their grades into the totals, without touching the name index.
+        Args:
+            student (Student): The student to add.
+        """
+        self.students.append(student)
+        self.by_id[student.id] = student
+        student.cohort = self
+        self.grade_count += student.grade_count
+        self.grade_total += student.grade_total
+        if student.has_passed():
+            self.passed_count += 1
+
+    def find_student(self, student_id):
+        """
+        Find a student by their ID.
+        Args:
+            student_id (str): The student's unique ID.
+        Returns:
+            Student: The matching student, or None if there is none.
+        """
+        return self.by_id.get(student_id)
+
+    def search_by_name(self, prefix, limit=None):
+        """
+        Find students whose name starts with a prefix (case-insensitive), in name order.
+        Args:
+            prefix (str): Beginning of the name to search for.
+            limit (int): Maximum number of students to return, or None for all.
+        Returns:
+            list: Matching Student objects.
+        """
+        prefix = prefix.lower()
+        matches = []
+        # Names sharing the prefix are adjacent in the sorted index.
+        for i in range(bisect.bisect_left(self._names, (prefix,)), len(self._names)):
+            name, position = self._names[i]
+            if not name.startswith(prefix) or len(matches) == limit:
+                break
+            matches.append(self.students[position])
+        return matches
+
+    def grade_added(self, student, grade, was_passing):
+        """
+        Update the totals after one of the students received a new grade.
+        Args:
+            student (Student): The student who received the grade.
+            grade (int): The new grade.
+            was_passing (bool): Whether the student was passing before the grade.
+        """
+        self.grade_count += 1
+        self.grade_total += grade
+        self.passed_count += student.has_passed() - was_passing
+        if self.journal:
+            self._append_to_journal({"id": student.id, "grade": grade})
+
+    def _append_to_journal(self, record):
+        """
+        Journal one change, stamped with the generation of the snapshot currently on disk.
+        Saving or compacting replaces the snapshot file, so the generation is read again
+        whenever the file changed, however the new snapshot was written.
+        Args:
+            record (dict): The change to journal.
+        """
+        try:
+            stat = os.stat(self.journal)
+            version = (stat.st_ino, stat.st_mtime_ns)
+        except FileNotFoundError:
+            version = None
+        if version != self._snapshot_version:
+            self.generation = read_generation(self.journal)
+            self._snapshot_version = version
+        record["generation"] = self.generation
+        append_to_journal(self.journal, record)
+
+    def calculate_average(self):
+        """
+        Calculate the average of every grade in the cohort.
+        Returns:
+            float: Average grade or 0 if there are no grades.
+        """
+        return self.grade_total / self.grade_count if self.grade_count else 0
+
+    def pass_rate(self):
+        """
+        Calculate the share of students who are currently passing.
+        Returns:
+            float: Fraction of passing students or 0 if there are no students.
+        """
+        return self.passed_count / len(self.students) if self.students else 0
+
+def journal_filename(filename):
+    """
+    Get the name of the change journal kept next to a JSON Lines file.
+    Args:
+        filename (str): Name of the JSON Lines file.
+    Returns:
+        str: Name of the journal file.
+    """
+    return filename + ".journal"
+
+def append_to_journal(filename, record):
     """
-    Save a list of students to a JSON file.
+    Append one change (a new student or a new grade) to a JSON Lines file's journal.
+    Args:
+        filename (str): Name of the JSON Lines file.
+        record (dict): Either {"student": {...}} or {"id": ..., "grade": ...},
+            plus the "generation" of the snapshot the change applies to.
+    """
+    with open(journal_filename(filename), 'a') as file:
+        file.write(json.dumps(record) + "\n")
+
+def read_generation(filename):
+    """
+    Read the generation number from the first line of a JSON Lines snapshot.
+    Args:
+        filename (str): Name of the JSON Lines file.
+    Returns:
+        int: The snapshot's generation, or 0 if the file is missing or predates generations.
+    """
+    try:
+        with open(filename, 'r') as file:
+            record = json.loads(file.readline().strip() or "{}")
+    except FileNotFoundError:
+        return 0
+    return record.get("generation", 0)
+
+def _write_atomically(filename, records, json_lines):
+    """
+    Write student records to a temporary file and rename it over the target.
+    Args:
+        filename (str): Name of the file to replace.
+        records (iterable): Student dictionaries to write.
+        json_lines (bool): Write one record per line instead of a JSON array.
+    """
+    temp_filename = filename + ".tmp"
+    with open(temp_filename, 'w') as file:
+        if json_lines:
+            for record in records:
+                file.write(json.dumps(record) + "\n")
+        else:
+            json.dump(list(records), file, indent=4)  # Write to JSON with indentation for readability.
+        file.flush()
+        os.fsync(file.fileno())  # Make sure the data is on disk before the rename.
+    os.replace(temp_filename, filename)  # The old file stays intact if anything above fails.
+
+def _write_snapshot(filename, records):
+    """
+    Write a JSON Lines snapshot one generation newer than the current one, then drop the journal.
+    The journal is removed after the rename, so a crash in between leaves journal records
+    from an older generation; loading skips those because the snapshot already has them.
+    Args:
+        filename (str): Name of the JSON Lines file.
+        records (iterable): Student dictionaries to write.
+    Returns:
+        int: Generation of the new snapshot.
+    """
+    generation = read_generation(filename) + 1
+    _write_atomically(filename, itertools.chain([{"generation": generation}], records), True)
+    if os.path.exists(journal_filename(filename)):
+        os.remove(journal_filename(filename))  # The snapshot already contains every journaled change.
+    return generation
+
+def save_students_to_file(students, filename=STUDENTS_FILE):
+    """
+    Save a list of students to a JSON (or JSON Lines) file as a crash-safe snapshot.
     Args:
         students (list): List of Student objects.
         filename (str): Name of the JSON file.
+    Returns:
+        int: Generation of a JSON Lines snapshot, or 0 for JSON.
     """
-    with open(filename, 'w') as file:
-        json_data = [student.to_dict() for student in students]  # Convert each student to a dictionary.
-        json.dump(json_data, file, indent=4)  # Write to JSON with indentation for readability.
+    generation = 0
+    if filename.endswith(".jsonl"):
+        generation = _write_snapshot(filename, (student.to_dict() for student in students))
+    else:
+        _write_atomically(filename, (student.to_dict() for student in students), False)
     print("Students saved to file successfully!")
+    return generation
+
+def compact_students_file(filename):
+    """
+    Fold a JSON Lines file's journal into a new snapshot, streaming one student at a time.
+    Args:
+        filename (str): Name of the JSON Lines file.
+    Returns:
+        int: Generation of the new snapshot.
+    """
+    return _write_snapshot(filename, (student.to_dict() for student in iter_students_from_file(filename)))
+
+def iter_students_from_file(filename=STUDENTS_FILE):
+    """
+    Yield students from a JSON file, or stream them from a JSON Lines file and its journal.
+    Args:
+        filename (str): Name of the JSON file.
+    Yields:
+        Student: Each stored student with all of their grades.
+    """
+    if not filename.endswith(".jsonl"):
+        with open(filename, 'r') as file:
+            data = json.load(file)  # Load data from JSON.
+        for d in data:
+            student = Student(d["name"], d["id"])
+            student.set_grades(d["grades"])  # Assign grades from JSON data.
+            yield student
+        return
+
+    # Read the (small) journal first so its changes can be applied while streaming.
+    generation = read_generation(filename)
+    new_students = []
+    new_grades = {}
+    try:
+        with open(journal_filename(filename), 'r') as file:
+            for line in file:
+                record = json.loads(line)
+                if record.get("generation", 0) < generation:
+                    continue  # Left over from a crash after a save; the snapshot already has it.
+                if "student" in record:
+                    new_students.append(record["student"])
+                else:
+                    new_grades.setdefault(record["id"], []).append(record["grade"])
+    except FileNotFoundError:
+        pass  # No changes since the last snapshot.
 
-def load_students_from_file(filename="students.json"):
+    def build(d):
+        student = Student(d["name"], d["id"])
+        student.set_grades(d["grades"] + new_grades.pop(d["id"], []))
+        return student
+
+    try:
+        with open(filename, 'r') as file:
+            for line in file:
+                if line.strip():
+                    record = json.loads(line)
+                    if "id" in record:  # Skip the generation header
+                        yield build(record)
+    except FileNotFoundError:
+        if not new_students:
+            raise  # Neither a snapshot nor any journaled students exist.
+    for d in new_students:
+        yield build(d)
+
+def load_students_from_file(filename=STUDENTS_FILE):
     """
     Load students from a JSON file.
     Args:
@@ -70,13 +396,9 @@ def load_students_from_file(filename="students.json"):
         list: List of Student objects.
     """
     try:
-        with open(filename, 'r') as file:
-            data = json.load(file)  # Load data from JSON.
-            students = [Student(d["name"], d["id"]) for d in data]  # Create Student objects.
-            for student, d in zip(students, data):
-                student.grades = d["grades"]  # Assign grades from JSON data.
-            print("Students loaded successfully!")
-            return students
+        students = list(iter_students_from_file(filename))
+        print("Students loaded successfully!")
+        return students
     except FileNotFoundError:
         print("No saved students found. Starting fresh.")
         return []
@@ -99,10 +421,7 @@ def add_grades(student):
     """
     print(f"Adding grades for {student.name}. You will enter grades for 5 subjects.")
 
-    # List of subjects for which grades will be entered.
-    subjects = ["Python Programming", "Theory of Programming", "NLP", "Prolog", "Maths"]
-
-    for subject in subjects:
+    for subject in SUBJECTS:
         while True:
             grade_input = input(f"Enter {subject} grade (0-100): ")
             try:
@@ -127,12 +446,114 @@ def show_student_info(student):
     print(f"Grades: {student.grades}")
     average = student.calculate_average()
     print(f"Average: {average:.2f}")
-    status = "Passed" if student.has_passed() else "Failed"
+    status = "Passed" if average >= PASS_MARK else "Failed"  # Reuse the average computed above.
     print(f"Status: {status}\n")
 
+def class_report(students):
+    """
+    Compute class-wide statistics for all students in one pass over their grades.
+    Args:
+        students (list): List of Student objects.
+    Returns:
+        dict: Per-subject statistics, the ranking by average, and the passed/failed students.
+    """
+    columns = [[] for _ in SUBJECTS]  # One column of grades per subject.
+    ranking = []
+    for student in students:
+        # Grades are entered one per subject in SUBJECTS order, so later rounds wrap around.
+        for i, grade in enumerate(student.grades):
+            columns[i % len(SUBJECTS)].append(grade)
+        ranking.append((student.calculate_average(), student))  # Average each student only once.
+    ranking.sort(key=lambda entry: entry[0], reverse=True)
+
+    subjects = {}
+    for subject, column in zip(SUBJECTS, columns):
+        if not column:
+            continue  # No grades recorded for this subject yet.
+        # quantiles() needs at least two grades, a single grade is every percentile.
+        quartiles = statistics.quantiles(column, n=4, method="inclusive") if len(column) > 1 else column * 3
+        subjects[subject] = {
+            "mean": sum(column) / len(column),
+            "quartiles": quartiles,
+            "pass_rate": sum(1 for grade in column if grade >= PASS_MARK) / len(column),
+        }
+
+    return {
+        "subjects": subjects,
+        "ranking": ranking,
+        "passed": [student for average, student in ranking if average >= PASS_MARK],
+        "failed": [student for average, student in ranking if average < PASS_MARK],
+    }
+
+def show_class_report(students):
+    """
+    Display per-subject statistics, the student ranking and the pass/fail report.
+    Args:
+        students (list): List of Student objects.
+    """
+    report = class_report(students)
+
+    print("\n--- Subject Statistics ---")
+    for subject, stats in report["subjects"].items():
+        q1, median, q3 = stats["quartiles"]
+        print(f"{subject}: Mean {stats['mean']:.2f}, Q1 {q1:.2f}, Median {median:.2f}, "
+              f"Q3 {q3:.2f}, Pass rate {stats['pass_rate']:.0%}")
+
+    print("\n--- Ranking ---")
+    for rank, (average, student) in enumerate(report["ranking"], 1):
+        status = "Passed" if average >= PASS_MARK else "Failed"
+        print(f"{rank}. {student.name} (ID: {student.id}) - Average: {average:.2f} - {status}")
+
+    print(f"\nPassed: {len(report['passed'])}, Failed: {len(report['failed'])}")
+
+def open_cohort(filename=STUDENTS_FILE):
+    """
+    Load the students into a cohort, journaling further changes when using JSON Lines.
+    Args:
+        filename (str): Name of the JSON file.
+    Returns:
+        Cohort: The loaded cohort.
+    """
+    cohort = Cohort(load_students_from_file(filename))
+    if filename.endswith(".jsonl"):
+        cohort.journal = filename  # New students and grades are appended, not rewritten.
+    return cohort
+
+def select_student(cohort):
+    """
+    Ask for a student ID or name and return the chosen student.
+    Args:
+        cohort (Cohort): The cohort to search.
+    Returns:
+        Student: The selected student, or None if no student was selected.
+    """
+    query = input("Enter student ID or name: ")
+    student = cohort.find_student(query)  # Try an exact ID match first.
+    if student:
+        return student
+
+    matches = cohort.search_by_name(query, limit=MAX_MATCHES)
+    if not matches:
+        print("No matching student found.")
+        return None
+    if len(matches) == 1:
+        return matches[0]
+
+    for i, student in enumerate(matches, 1):
+        print(f"{i}. {student.name} (ID: {student.id})")
+    try:
+        student_index = int(input("Select a student by number: ")) - 1
+    except ValueError:
+        student_index = -1
+    if 0 <= student_index < len(matches):
+        return matches[student_index]
+    print("Invalid choice.")
+    return None
+
 def main():
     """Main function to run the student grades management system."""
-    students = load_students_from_file()  # Load students from file at startup.
+    cohort = open_cohort()  # Load students from file at startup.
+    students = cohort.students
 
     while True:
         print("\n--- Student Grades System ---")
@@ -141,45 +562,46 @@ def main():
         print("3. Show Student Info")
         print("4. Save Students to File")
         print("5. Load Students from File")
-        print("6. Exit")
+        print("6. Show Class Report")
+        print("7. Exit")
         choice = input("Enter your choice: ")
 
         if choice == '1':
             student = add_student()
-            students.append(student)  # Add the new student to the list.
+            cohort.add_student(student)  # Add the new student to the cohort.
             print("Student added successfully!")
 
         elif choice == '2':
             if not students:
                 print("No students available. Add a student first.")
                 continue  # Skip to the next iteration if no students are available.
-            for i, student in enumerate(students, 1):
-                print(f"{i}. {student.name} (ID: {student.id})")
-            student_index = int(input("Select a student by number: ")) - 1
-            if 0 <= student_index < len(students):
-                add_grades(students[student_index])  # Add grades to the selected student.
-            else:
-                print("Invalid choice.")
+            student = select_student(cohort)
+            if student:
+                add_grades(student)  # Add grades to the selected student.
 
         elif choice == '3':
             if not students:
                 print("No students available.")
                 continue
-            for i, student in enumerate(students, 1):
-                print(f"{i}. {student.name} (ID: {student.id})")
-            student_index = int(input("Select a student by number: ")) - 1
-            if 0 <= student_index < len(students):
-                show_student_info(students[student_index])  # Show the selected student's info.
-            else:
-                print("Invalid choice.")
+            student = select_student(cohort)
+            if student:
+                show_student_info(student)  # Show the selected student's info.
 
         elif choice == '4':
-            save_students_to_file(students)  # Save students to the file.
+            save_students_to_file(students)  # Save a full snapshot (and clear any journal).
 
         elif choice == '5':
-            students = load_students_from_file()  # Reload students from the file.
+            cohort = open_cohort()  # Reload students from the file.
+            students = cohort.students
 
         elif choice == '6':
+            if not students:
+                print("No students available.")
+                continue
+            show_class_report(students)  # Show statistics for the whole class.
+            print(f"Class average: {cohort.calculate_average():.2f}, Pass rate: {cohort.pass_rate():.0%}")
+
+        elif choice == '7':
             print("Exiting... Goodbye!")
             break  # Exit the program.
 
@@ -1,33 +1,408 @@
+import asyncio
+import bisect
 import csv
+import functools
+import heapq
+import inspect
+import io
+import itertools
+import os
+import sys
+import time
 from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import date
+
+PAGE_SIZE = 20  # Number of tasks shown per page
+PENDING_STATUSES = ('Pending', 'Running')  # Statuses of tasks that are not finished yet
+FINAL_STATUSES = ('Completed', 'Failed', 'Cancelled')
+
+
+def insert_id(ids, task_id):
+    """Insert a task ID into a sorted list, appending when it is the largest (the usual case)."""
+    if ids and task_id < ids[-1]:
+        bisect.insort(ids, task_id)
+    else:
+        ids.append(task_id)
+
+
+def iter_from(index, position):
+    """Yield the entries of a list from position onward, without copying or skipping through it."""
+    for i in range(position, len(index)):
+        yield index[i]
+
+
+def timed_call(action):
+    """Run an action and time it where it runs, so time spent queued for a worker is not counted.
+
+    Returns (result, error, seconds); error is None when the action succeeded.
+    Defined at module level so process pools can pickle it.
+    """
+    start = time.perf_counter()
+    try:
+        result, error = action(), None
+    except Exception as exc:
+        result, error = None, exc
+    return result, error, time.perf_counter() - start
+
+
+class IdIndex:
+    BUFFER_SIZE = 4096  # Out-of-order IDs collected before they are merged into the main list
+
+    def __init__(self):
+        """Initialize an empty set of task IDs that can be read in ID order.
+
+        IDs larger than every stored one are appended; others go to a small
+        sorted buffer that is merged in once it fills, so adding an ID costs
+        O(1) amortized instead of an insert into a long list.
+        """
+        self._ids = []
+        self._buffer = []
+
+    def add(self, task_id):
+        """Add a task ID."""
+        if not self._ids or task_id > self._ids[-1]:
+            self._ids.append(task_id)  # Both lists stay sorted, which is all iter_after needs
+        else:
+            bisect.insort(self._buffer, task_id)
+            if len(self._buffer) > self.BUFFER_SIZE:
+                self._ids = sorted(self._ids + self._buffer)  # Merges the two sorted runs in C
+                self._buffer = []
+
+    def iter_after(self, cursor=None):
+        """Yield the IDs greater than cursor (or all IDs) in ascending order."""
+        return heapq.merge(*(iter_from(ids, bisect.bisect_right(ids, cursor) if cursor is not None else 0)
+                             for ids in (self._ids, self._buffer)))
+
+    def keep(self, predicate):
+        """Drop every ID for which predicate(ID) is false, in one pass."""
+        self._ids = [task_id for task_id in self.iter_after() if predicate(task_id)]
+        self._buffer = []
+
 
 class Task:
-    def __init__(self, title, description):
-        """Initialize a task with title, description, and status."""
+    def __init__(self, title, description, priority=0, due_date=None, task_id=None, action=None):
+        """Initialize a task with title, description, priority, optional due date, and status."""
+        self.id = task_id
         self.title = title
         self.description = description
-        self.status = 'Pending'
+        self.priority = priority  # Higher numbers are scheduled first
+        self.due_date = due_date  # Optional deadline as 'YYYY-MM-DD'
+        self.status = 'Pending'  # Pending, Running, Completed, Failed or Cancelled
+
+        # Execution details, used when the task is run by run_pending()
+        self.action = action  # Callable (or coroutine function) taking no arguments
+        self.attempts = 0
+        self.latency = None  # Seconds the last attempt's action ran, not counting time spent queued
+        self.result = None
+        self.error = None
+        self.future = None  # Future of the current attempt while it is running
 
     def mark_complete(self):
         """Mark this task as completed."""
         self.status = 'Completed'
 
+    def schedule_key(self):
+        """Return the sort key used to pick the next task: priority, then due date, then age."""
+        return (-self.priority, self.due_date is None, self.due_date or '', self.id)
+
     def __str__(self):
         """Return string representation of a task."""
-        return f"Title: {self.title}, Description: {self.description}, Status: {self.status}"
+        due = f", Due: {self.due_date}" if self.due_date else ""
+        return (f"ID: {self.id}, Title: {self.title}, Description: {self.description}, "
+                f"Priority: {self.priority}{due}, Status: {self.status}")
 
 
 class TaskManager:
-    def __init__(self):
-        """Initialize TaskManager with empty queues."""
-        self.pending_tasks = deque()
-        self.completed_tasks = []
-
-    def add_task(self, title, description):
-        """Add a task to the pending queue."""
-        task = Task(title, description)
-        self.pending_tasks.append(task)
+    def __init__(self, completed_limit=None, archive_file=None):
+        """Initialize TaskManager with an empty schedule.
+
+        When completed_limit is set, only that many completed tasks are kept in
+        memory; older ones are appended to archive_file (if given) and dropped.
+        """
+        self.completed_limit = completed_limit
+        self.archive_file = archive_file
+        self._clear()
+
+        # Incremental checkpointing, see enable_checkpointing()
+        self.checkpoint_file = None
+        self.checkpoint_every = None
+        self._journal_entries = 0
+
+    def _clear(self):
+        """Remove every task and reset the indexes."""
+        self.pending_tasks = {}  # Pending tasks by ID, in the order they were added
+        self.completed_tasks = deque()
+        self.failed_tasks = []  # Tasks that failed or were cancelled
+        self._schedule = []  # Heap of (schedule key, ID); completed entries are skipped lazily
+        self._next_id = 1
+
+        # Indexes for paged listings; entries of archived tasks are skipped lazily
+        self._tasks = {}  # Every task kept in memory, by ID
+        self._ids = []  # Sorted task IDs
+        # IDs of the tasks with each status; running tasks stay under 'Pending'. Tasks that
+        # finish or are archived leave stale entries behind, skipped lazily and purged in bulk.
+        self._ids_by_status = {status: IdIndex() for status in ('Pending',) + FINAL_STATUSES}
+        self._stale_status_ids = 0
+        self._titles = []  # Sorted (lowercase title, ID) pairs
+        self._archived = 0  # Stale index entries left by archived tasks
+
+    def add_task(self, title, description, priority=0, due_date=None, action=None):
+        """Add a task to the pending tasks and the schedule."""
+        task = Task(title, description, priority, due_date, self._next_id, action)
+        self._add(task)
+        bisect.insort(self._titles, (task.title.lower(), task.id))
+        heapq.heappush(self._schedule, (task.schedule_key(), task.id))
+        self._journal(['add', task.id, task.title, task.description, task.priority, task.due_date or ''])
         print(f"Task added: {task.title}")
+        return task
+
+    def _add(self, task):
+        """Register a new pending task (without scheduling or title-indexing it) and advance the ID counter."""
+        self.pending_tasks[task.id] = task
+        self._tasks[task.id] = task
+        insert_id(self._ids, task.id)
+        self._ids_by_status['Pending'].add(task.id)
+        self._next_id = max(self._next_id, task.id + 1)
+
+    def next_task(self):
+        """Return the pending task that should run next, or None if there is none."""
+        # Drop heap entries for tasks that were completed out of order
+        while self._schedule and self._schedule[0][1] not in self.pending_tasks:
+            heapq.heappop(self._schedule)
+        return self.pending_tasks[self._schedule[0][1]] if self._schedule else None
+
+    def complete_next_task(self):
+        """Mark the highest-priority pending task as completed."""
+        task = self.next_task()
+        if task is None:
+            print("No pending tasks.")
+        else:
+            self.complete_task_by_id(task.id)
+
+    def complete_task_by_id(self, task_id):
+        """Mark the pending task with the given ID as completed."""
+        task = self.pending_tasks.get(task_id)
+        if task is None:
+            print(f"No pending task with ID {task_id}.")
+            return None
+
+        self._finish(task, 'Completed')
+        print(f"Task completed: {task.title}")
+        return task
+
+    def cancel_task(self, task_id):
+        """Cancel a pending task, or a running one whose action has not started yet."""
+        task = self.pending_tasks.get(task_id)
+        if task is None:
+            print(f"No pending task with ID {task_id}.")
+            return
+        # Cancelling an asyncio task would interrupt an action that has already started
+        started = isinstance(task.future, asyncio.Task) and task.status == 'Running'
+        if task.future is None:
+            self._finish(task, 'Cancelled')
+            print(f"Task cancelled: {task.title}")
+        elif not started and task.future.cancel():
+            print(f"Task cancelled: {task.title}")  # The runner records the cancellation
+        else:
+            print(f"Task is already running: {task.title}")
+
+    def run_pending(self, mode='thread', max_workers=None, retries=0):
+        """Run every pending task that has an action, in schedule order.
+
+        mode is 'thread', 'process' or 'asyncio'. A failing action is retried up
+        to `retries` more times before the task is marked as failed. Returns the
+        tasks that were run.
+        """
+        tasks = sorted((t for t in self.pending_tasks.values() if t.action), key=Task.schedule_key)
+        if mode == 'asyncio':
+            asyncio.run(self._run_async(tasks, max_workers, retries))
+        elif mode in ('thread', 'process'):
+            pool = ThreadPoolExecutor if mode == 'thread' else ProcessPoolExecutor
+            with pool(max_workers=max_workers) as executor:
+                self._run_in_pool(tasks, executor, retries)
+        else:
+            raise ValueError(f"Unknown execution mode: {mode}")
+
+        latencies = [t.latency for t in tasks if t.latency is not None]
+        average = sum(latencies) / len(latencies) if latencies else 0
+        counts = {status: sum(1 for t in tasks if t.status == status) for status in ('Completed', 'Failed', 'Cancelled')}
+        print(f"Ran {len(tasks)} tasks: {counts['Completed']} completed, {counts['Failed']} failed, "
+              f"{counts['Cancelled']} cancelled. Average latency: {average * 1000:.1f} ms")
+        return tasks
+
+    def _run_in_pool(self, tasks, executor, retries):
+        """Run tasks on a thread or process pool, retrying failures."""
+        futures = {self._submit(executor, task): task for task in tasks}
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = futures.pop(future)
+                if future.cancelled():
+                    self._finish(task, 'Cancelled')
+                    continue
+                if future.exception() is None:
+                    result, error, task.latency = future.result()
+                else:
+                    result, error = None, future.exception()  # e.g. the action could not be sent to a process
+                if error is None:
+                    task.result = result
+                    self._finish(task, 'Completed')
+                elif task.attempts <= retries:
+                    futures[self._submit(executor, task)] = task
+                else:
+                    task.error = error
+                    self._finish(task, 'Failed')
+
+    def _submit(self, executor, task):
+        """Start one attempt of a task on a pool and return its future."""
+        task.attempts += 1
+        task.status = 'Running'
+        task.future = executor.submit(timed_call, task.action)
+        return task.future
+
+    async def _run_async(self, tasks, max_workers, retries):
+        """Run tasks on an asyncio event loop, at most max_workers at a time."""
+        limit = asyncio.Semaphore(max_workers or os.cpu_count() or 1)
+
+        async def run(task):
+            async with limit:
+                while True:
+                    task.attempts += 1
+                    task.status = 'Running'
+                    if inspect.iscoroutinefunction(task.action):
+                        start = time.perf_counter()
+                        try:
+                            result, error = await task.action(), None
+                        except Exception as exc:
+                            result, error = None, exc
+                        task.latency = time.perf_counter() - start
+                    else:
+                        # Timed in the worker thread, like the pool modes
+                        result, error, task.latency = await asyncio.to_thread(timed_call, task.action)
+
+                    if error is None:
+                        task.result = result
+                        self._finish(task, 'Completed')
+                        return
+                    if task.attempts > retries:
+                        task.error = error
+                        self._finish(task, 'Failed')
+                        return
+
+        def record_cancellation(future, task):
+            # Covers tasks cancelled while waiting for the semaphore or before they ever ran
+            if future.cancelled():
+                self._finish(task, 'Cancelled')
+
+        for task in tasks:
+            task.future = asyncio.ensure_future(run(task))
+            task.future.add_done_callback(functools.partial(record_cancellation, task=task))
+        await asyncio.gather(*(task.future for task in tasks), return_exceptions=True)
+
+    def _finish(self, task, status):
+        """Move a task out of the pending tasks with its final status."""
+        if self.pending_tasks.pop(task.id, None) is None:
+            return  # Already finished, e.g. completed by hand while running
+
+        task.future = None
+        self._ids_by_status[status].add(task.id)
+        self._stale_status_ids += 1  # Its entry under 'Pending'
+        if status == 'Completed':
+            task.mark_complete()
+            self.completed_tasks.append(task)
+            if self.completed_limit is not None and len(self.completed_tasks) > self.completed_limit:
+                self._archive(self.completed_tasks.popleft())
+        else:
+            task.status = status
+            self.failed_tasks.append(task)
+        # Rebuild the heap once stale entries outnumber the live ones
+        if len(self._schedule) > 2 * len(self.pending_tasks) + 16:
+            self._schedule = [(t.schedule_key(), t.id) for t in self.pending_tasks.values()]
+            heapq.heapify(self._schedule)
+        if self._stale_status_ids > len(self._tasks) + 16:
+            self._purge_status_ids()
+        # Journal last: a checkpoint triggered here must already see the task in its final place
+        self._journal([status, task.id])
+
+    def _archive(self, task):
+        """Drop an old completed task from memory, appending it to the archive file if set."""
+        if self.archive_file:
+            with open(self.archive_file, mode='a', newline='') as file:
+                csv.writer(file).writerow([task.id, task.title, task.description, task.status, task.priority, task.due_date or ''])
+        del self._tasks[task.id]
+        self._stale_status_ids += 1
+        self._archived += 1
+        # Purge the stale index entries once they outnumber the live ones
+        if self._archived > len(self._tasks):
+            self._ids = [task_id for task_id in self._ids if task_id in self._tasks]
+            self._titles = [entry for entry in self._titles if entry[1] in self._tasks]
+            self._archived = 0
+
+    def _purge_status_ids(self):
+        """Drop the status index entries of tasks that finished or were archived."""
+        for name, ids in self._ids_by_status.items():
+            def current(task_id, name=name):
+                task = self._tasks.get(task_id)
+                return task is not None and ('Pending' if task.status in PENDING_STATUSES else task.status) == name
+            ids.keep(current)
+        self._stale_status_ids = 0
+
+    def page_tasks(self, status=None, title_prefix=None, cursor=None, limit=PAGE_SIZE):
+        """Return up to `limit` tasks after `cursor` and the cursor for the next page.
+
+        status is a status or tuple of statuses to keep. Tasks are ordered by ID,
+        or by title when title_prefix is given. Without a title prefix, a status
+        filter reads only the ID lists of those statuses, so a page costs about
+        O(limit) amortized however many other tasks there are. The returned cursor is None
+        on the last page.
+        """
+        statuses = (status,) if isinstance(status, str) else status
+        if title_prefix is not None:
+            prefix = title_prefix.lower()
+            index = self._titles
+            position = bisect.bisect_right(index, cursor) if cursor is not None else bisect.bisect_left(index, (prefix,))
+            # (cursor, ID) pairs, stopping after the last title with this prefix
+            entries = ((entry, entry[1]) for entry in
+                       itertools.takewhile(lambda entry: entry[0].startswith(prefix), iter_from(index, position)))
+        else:
+            if statuses is None:
+                ids = iter_from(self._ids, bisect.bisect_right(self._ids, cursor) if cursor is not None else 0)
+            else:
+                names = {'Pending' if name in PENDING_STATUSES else name for name in statuses}
+                ids = heapq.merge(*(self._ids_by_status[name].iter_after(cursor)
+                                    for name in names if name in self._ids_by_status))
+            # A finished task can still have a stale entry under 'Pending'; drop the repeat
+            entries = ((task_id, task_id) for task_id, _ in itertools.groupby(ids))
+
+        page = []
+        next_cursor = None
+        for key, task_id in entries:
+            task = self._tasks.get(task_id)
+            if task is None or (statuses is not None and task.status not in statuses):
+                continue  # Archived or finished task, or a running task when only 'Pending' was asked for
+            if len(page) == limit:
+                next_cursor = page_end  # Another matching task exists, so there is a next page
+                break
+            page.append(task)
+            page_end = key
+        return page, next_cursor
+
+    def display_tasks(self, heading, empty_message, status=None, title_prefix=None):
+        """Display matching tasks one page at a time, writing each page at once."""
+        tasks, cursor = self.page_tasks(status, title_prefix)
+        if not tasks:
+            print(empty_message)
+            return
+
+        print(f"\n{heading}:")
+        while True:
+            sys.stdout.write("\n".join(map(str, tasks)) + "\n")
+            if cursor is None or input("Press Enter for more, or 'q' to stop: ").lower() == 'q':
+                break
+            tasks, cursor = self.page_tasks(status, title_prefix, cursor)
+            if not tasks:
+                break
 
     def complete_task(self):
         """Mark a selected task as completed."""
@@ -35,57 +410,154 @@ class TaskManager:
             print("No pending tasks.")
             return
 
-        # Display tasks with indices
+        # Display the first page of tasks with their IDs
         print("\nSelect a task to complete:")
-        for index, task in enumerate(self.pending_tasks):
-            print(f"{index + 1}. {task}")
+        tasks, cursor = self.page_tasks(PENDING_STATUSES)
+        sys.stdout.write("\n".join(map(str, tasks)) + "\n")
+        if cursor is not None:
+            print(f"(Showing {len(tasks)} of {len(self.pending_tasks)} pending tasks)")
 
         try:
-            choice = int(input("Enter the task number to mark as completed: ")) - 1
-            if 0 <= choice < len(self.pending_tasks):
-                task = self.pending_tasks[choice]
-                task.mark_complete()
-                self.completed_tasks.append(task)
-                self.pending_tasks.remove(task)
-                print(f"Task completed: {task.title}")
+            task_id = int(input("Enter the ID of the task to mark as completed: "))
+            if task_id in self.pending_tasks:
+                self.complete_task_by_id(task_id)
             else:
-                print("Invalid task number.")
+                print("Invalid task ID.")
         except ValueError:
             print("Invalid input. Please enter a number.")
 
     def display_pending_tasks(self):
         """Display all pending tasks."""
-        if not self.pending_tasks:
-            print("No pending tasks.")
-        else:
-            print("\nPending Tasks:")
-            for task in self.pending_tasks:
-                print(task)
+        self.display_tasks("Pending Tasks", "No pending tasks.", PENDING_STATUSES)
 
     def display_completed_tasks(self):
         """Display all completed tasks."""
-        if not self.completed_tasks:
-            print("No completed tasks.")
-        else:
-            print("\nCompleted Tasks:")
-            for task in self.completed_tasks:
-                print(task)
+        self.display_tasks("Completed Tasks", "No completed tasks.", 'Completed')
 
     def save_tasks_to_csv(self, filename='tasks.csv'):
         """Save all tasks to a CSV file."""
-        with open(filename, mode='w', newline='') as file:
+        self._write_snapshot(filename)
+        print(f"Tasks saved to {filename}.")
+
+    def load_tasks_from_csv(self, filename='tasks.csv'):
+        """Replace all tasks with those in a CSV file, reading it one row at a time.
+
+        The file is read into a fresh TaskManager (which journals nothing) and
+        swapped in only once every row has been parsed, so a missing file or a
+        bad row (ValueError, KeyError or csv.Error) leaves the current tasks alone.
+        """
+        loaded = TaskManager(self.completed_limit, self.archive_file)
+        with open(filename, mode='r', newline='') as file:
+            for row in csv.DictReader(file):
+                # Older files have no ID, Priority or Due Date columns
+                task_id = int(row['ID']) if row.get('ID') else loaded._next_id
+                task = Task(row['Title'], row['Description'], int(row.get('Priority') or 0),
+                            row.get('Due Date') or None, task_id)
+                loaded._add(task)
+                if row['Status'] == 'Completed':
+                    loaded._finish(task, 'Completed')
+                elif row['Status'] in ('Failed', 'Cancelled'):
+                    loaded._finish(task, row['Status'])
+
+        # Build the schedule and title index in one pass instead of one insert per task
+        loaded._schedule = [(t.schedule_key(), t.id) for t in loaded.pending_tasks.values()]
+        heapq.heapify(loaded._schedule)
+        loaded._titles = sorted((t.title.lower(), t.id) for t in loaded._tasks.values())
+
+        # Swap in the loaded tasks and indexes, keeping this manager's checkpoint settings
+        checkpointing = ('checkpoint_file', 'checkpoint_every', '_journal_entries')
+        vars(self).update((name, value) for name, value in vars(loaded).items() if name not in checkpointing)
+        print(f"Loaded {len(self.pending_tasks)} pending and "
+              f"{len(self.completed_tasks) + len(self.failed_tasks)} finished tasks from {filename}.")
+
+    def enable_checkpointing(self, filename='tasks.csv', checkpoint_every=1000):
+        """Restore tasks from a snapshot and its journal, then journal every later change.
+
+        Adds and completions are appended to `<filename>.journal`; after
+        `checkpoint_every` journal entries the snapshot is rewritten and the
+        journal cleared, so saving costs depend on the number of changes.
+        """
+        if os.path.exists(filename):
+            self.load_tasks_from_csv(filename)
+        replayed = os.path.exists(filename + '.journal')
+        if replayed:
+            self._replay_journal(filename + '.journal')
+        self.checkpoint_file = filename
+        self.checkpoint_every = checkpoint_every
+        if replayed:
+            self.checkpoint()  # Start a clean journal, so new entries never follow a torn line
+
+    def checkpoint(self):
+        """Write a fresh snapshot and clear the journal."""
+        self._write_snapshot(self.checkpoint_file)
+        open(self.checkpoint_file + '.journal', 'w').close()
+        self._journal_entries = 0
+
+    def _replay_journal(self, journal_file):
+        """Apply the adds and completions recorded after the last snapshot."""
+        snapshot_next_id = self._next_id
+        with open(journal_file, mode='r', newline='') as file:
+            text = file.read()  # Small: the journal is cleared every checkpoint_every entries
+        # A crash in the middle of an append leaves a last line without its line ending
+        text = text[:text.rfind('\n') + 1]
+        for row in csv.reader(io.StringIO(text)):
+            if row and row[0] == 'add' and len(row) == 6:
+                task_id = int(row[1])
+                if task_id >= snapshot_next_id:  # Skip adds the snapshot already holds
+                    task = Task(row[2], row[3], int(row[4]), row[5] or None, task_id)
+                    self._add(task)
+                    bisect.insort(self._titles, (task.title.lower(), task.id))
+                    heapq.heappush(self._schedule, (task.schedule_key(), task.id))
+            elif len(row) == 2 and row[0] in FINAL_STATUSES and int(row[1]) in self.pending_tasks:
+                self._finish(self.pending_tasks[int(row[1])], row[0])
+
+    def _journal(self, row):
+        """Append one change to the journal, checkpointing when it grows too long."""
+        if self.checkpoint_file is None:
+            return
+        with open(self.checkpoint_file + '.journal', mode='a', newline='') as file:
+            csv.writer(file).writerow(row)
+        self._journal_entries += 1
+        if self._journal_entries >= self.checkpoint_every:
+            self.checkpoint()
+
+    def _write_snapshot(self, filename):
+        """Write all tasks to a temporary CSV file and rename it over the target."""
+        temp_filename = filename + '.tmp'
+        with open(temp_filename, mode='w', newline='') as file:
             writer = csv.writer(file)
-            writer.writerow(['Title', 'Description', 'Status'])  # Header
+            writer.writerow(['ID', 'Title', 'Description', 'Status', 'Priority', 'Due Date'])  # Header
 
             # Write pending tasks
-            for task in self.pending_tasks:
-                writer.writerow([task.title, task.description, task.status])
+            for task in self.pending_tasks.values():
+                writer.writerow([task.id, task.title, task.description, task.status, task.priority, task.due_date or ''])
 
-            # Write completed tasks
-            for task in self.completed_tasks:
-                writer.writerow([task.title, task.description, task.status])
+            # Write completed, failed and cancelled tasks
+            for task in itertools.chain(self.completed_tasks, self.failed_tasks):
+                writer.writerow([task.id, task.title, task.description, task.status, task.priority, task.due_date or ''])
+        os.replace(temp_filename, filename)
 
-        print(f"Tasks saved to {filename}.")
+
+def read_priority():
+    """Prompt for a task priority, defaulting to 0."""
+    while True:
+        value = input("Enter task priority (higher runs first, default 0): ")
+        try:
+            return int(value) if value else 0
+        except ValueError:
+            print("Invalid input. Please enter a number.")
+
+
+def read_due_date():
+    """Prompt for an optional due date in YYYY-MM-DD format."""
+    while True:
+        value = input("Enter due date (YYYY-MM-DD, leave blank for none): ")
+        if not value:
+            return None
+        try:
+            return date.fromisoformat(value).isoformat()
+        except ValueError:
+            print("Invalid date. Please use the format YYYY-MM-DD.")
 
 
 def main():
@@ -96,33 +568,54 @@ def main():
         print("\n--- Task Manager ---")
         print("1. Add Task")
         print("2. Complete Task")
-        print("3. Display Pending Tasks")
-        print("4. Display Completed Tasks")
-        print("5. Save Tasks to CSV")
-        print("6. Exit")
-        choice = input("Enter your choice (1-6): ")
+        print("3. Complete Next Task")
+        print("4. Display Pending Tasks")
+        print("5. Display Completed Tasks")
+        print("6. Save Tasks to CSV")
+        print("7. Load Tasks from CSV")
+        print("8. Search Tasks by Title")
+        print("9. Exit")
+        choice = input("Enter your choice (1-9): ")
 
         if choice == '1':
             title = input("Enter task title: ")
             description = input("Enter task description: ")
-            task_manager.add_task(title, description)
+            priority = read_priority()
+            due_date = read_due_date()
+            task_manager.add_task(title, description, priority, due_date)
 
         elif choice == '2':
             task_manager.complete_task()
 
         elif choice == '3':
-            task_manager.display_pending_tasks()
+            task_manager.complete_next_task()
 
         elif choice == '4':
-            task_manager.display_completed_tasks()
+            task_manager.display_pending_tasks()
 
         elif choice == '5':
+            task_manager.display_completed_tasks()
+
+        elif choice == '6':
             filename = input("Enter filename to save tasks (default: tasks.csv): ") or 'tasks.csv'
             if not filename.endswith('.csv'):
                 filename += '.csv'  # Ensure correct file extension
             task_manager.save_tasks_to_csv(filename)
 
-        elif choice == '6':
+        elif choice == '7':
+            filename = input("Enter filename to load tasks from (default: tasks.csv): ") or 'tasks.csv'
+            try:
+                task_manager.load_tasks_from_csv(filename)
+            except FileNotFoundError:
+                print(f"File '{filename}' not found.")
+            except (ValueError, KeyError, csv.Error) as error:
+                print(f"Could not load '{filename}': bad row ({error!r}). Tasks were not changed.")
+
+        elif choice == '8':
+            prefix = input("Enter the start of the task title: ")
+            task_manager.display_tasks(f"Tasks starting with '{prefix}'", "No matching tasks.", title_prefix=prefix)
+
+        elif choice == '9':
             print("Exiting Task Manager. Goodbye!")
             break
 
@@ -1,3 +1,25 @@
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal, ROUND_HALF_UP
+
+
+def to_cents(price):
+    """Convert a price in dollars to a whole number of cents."""
+    return int((Decimal(str(price)) * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+
+def format_cents(cents):
+    """Format a whole number of cents as dollars, e.g. 1999 -> '19.99' and -150 -> '-1.50'."""
+    sign = "-" if cents < 0 else ""
+    return f"{sign}{abs(cents) // 100}.{abs(cents) % 100:02d}"  # Floor division on negatives would give -2.50
+
+
 class Product:
     def __init__(self, name, price, quantity):
         """Initialize a product with a name, price, and quantity."""
@@ -13,48 +35,248 @@ class Product:
 class ShoppingCart:
     def __init__(self):
         """Initialize an empty shopping cart."""
-        self.cart = {}  # Dictionary to hold products in the cart
+        self.cart = {}  # Dictionary to hold products in the cart, with prices in cents
+        self.total_cents = 0  # Running total, kept up to date by every change
+        self._lock = threading.RLock()  # Guards cart and total_cents; never held across an await
 
     def add_product(self, product):
         """Add a product to the cart. If it already exists, update the quantity."""
-        if product.name in self.cart:
-            self.cart[product.name]['quantity'] += product.quantity
-        else:
-            self.cart[product.name] = {'price': product.price, 'quantity': product.quantity}
+        self._add_line(product.name, to_cents(product.price), product.quantity)
         print(f"Added {product.quantity} of '{product.name}' to the cart.")
 
     def remove_product(self, product_name, quantity):
         """Remove a specified quantity of a product from the cart."""
-        if product_name in self.cart:
-            if quantity >= self.cart[product_name]['quantity']:
-                del self.cart[product_name]  # Remove product if quantity is zero or less
-                print(f"Removed '{product_name}' from the cart.")
-            else:
-                self.cart[product_name]['quantity'] -= quantity
-                print(f"Removed {quantity} of '{product_name}' from the cart.")
-        else:
+        remaining = self._remove_line(product_name, quantity)
+        if remaining is None:
             print(f"Product '{product_name}' not found in the cart.")
+        elif remaining == 0:
+            print(f"Removed '{product_name}' from the cart.")
+        else:
+            print(f"Removed {quantity} of '{product_name}' from the cart.")
+
+    def apply_lines(self, lines):
+        """Apply many (name, price, quantity) changes at once; a negative quantity removes items."""
+        count = 0
+        with self._lock:  # Other threads see either none or all of the batch
+            for name, price, quantity in lines:
+                if quantity >= 0:
+                    self._add_line(name, to_cents(price), quantity)
+                else:
+                    self._remove_line(name, -quantity)
+                count += 1
+            total_cents = self.total_cents
+        print(f"Applied {count} changes to the cart. Total Price: ${format_cents(total_cents)}")
+
+    # The async variants run the work in a worker thread, so waiting for the
+    # lock or applying a large batch never blocks the event loop.
+    async def add_product_async(self, product):
+        """Coroutine version of add_product() for use from an asyncio event loop."""
+        await asyncio.to_thread(self.add_product, product)
+
+    async def remove_product_async(self, product_name, quantity):
+        """Coroutine version of remove_product() for use from an asyncio event loop."""
+        await asyncio.to_thread(self.remove_product, product_name, quantity)
+
+    async def apply_lines_async(self, lines):
+        """Coroutine version of apply_lines() for use from an asyncio event loop."""
+        await asyncio.to_thread(self.apply_lines, lines)
+
+    def _add_line(self, name, price_cents, quantity):
+        """Add a quantity of a product and update the running total."""
+        with self._lock:
+            if name in self.cart:
+                self.cart[name]['quantity'] += quantity
+            else:
+                self.cart[name] = {'price_cents': price_cents, 'quantity': quantity}
+            self.total_cents += self.cart[name]['price_cents'] * quantity
+
+    def _remove_line(self, name, quantity):
+        """Remove up to a quantity of a product, returning the quantity left (None if absent)."""
+        with self._lock:
+            details = self.cart.get(name)
+            if details is None:
+                return None
+            if quantity >= details['quantity']:
+                quantity = details['quantity']
+                del self.cart[name]  # Remove product if quantity is zero or less
+            else:
+                details['quantity'] -= quantity
+            self.total_cents -= details['price_cents'] * quantity
+            return details['quantity'] if name in self.cart else 0
 
     def calculate_total(self):
-        """Calculate and return the total price of the items in the cart."""
-        total = sum(item['price'] * item['quantity'] for item in self.cart.values())
-        return total
+        """Return the total price of the items in the cart."""
+        return self.total_cents / 100
 
     def display_cart(self):
         """Display the contents of the shopping cart."""
-        if not self.cart:
+        with self._lock:  # Take a consistent snapshot of the lines and total
+            lines = [(name, details['price_cents'], details['quantity']) for name, details in self.cart.items()]
+            total_cents = self.total_cents
+        if not lines:
             print("The shopping cart is empty.")
             return
 
         print("\nShopping Cart Contents:")
-        for product_name, details in self.cart.items():
-            print(f"{product_name} - Price: ${details['price']:.2f}, Quantity: {details['quantity']}")
-        print(f"Total Price: ${self.calculate_total():.2f}")
+        for product_name, price_cents, quantity in lines:
+            print(f"{product_name} - Price: ${format_cents(price_cents)}, Quantity: {quantity}")
+        print(f"Total Price: ${format_cents(total_cents)}")
+
+    def to_dict(self):
+        """Return the cart contents as {name: [price_cents, quantity]} for compact storage."""
+        with self._lock:
+            return {name: [details['price_cents'], details['quantity']] for name, details in self.cart.items()}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create a cart from the output of to_dict()."""
+        cart = cls()
+        for name, (price_cents, quantity) in data.items():
+            cart._add_line(name, price_cents, quantity)
+        return cart
+
+
+class CartStore:
+    def __init__(self, directory='carts', max_carts=10000, ttl=None):
+        """Initialize a store that keeps at most max_carts carts in memory.
+
+        Carts that are least recently used, or unused for more than ttl seconds,
+        are written to `directory` and loaded back when their session returns.
+        A cart returned by get_cart() is pinned in memory until release_cart()
+        is called for it, so changes made through it are never lost.
+        """
+        self.directory = directory
+        self.max_carts = max_carts
+        self.ttl = ttl
+        self.carts = OrderedDict()  # Session ID -> (cart, last use time), least recently used first
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._pins = {}  # Session ID -> number of callers holding its cart; pinned carts are never evicted
+        self._lock = threading.Lock()  # Guards carts and the counters
+        os.makedirs(directory, exist_ok=True)
+
+    def get_cart(self, session_id):
+        """Return the cart for a session, loading it from disk or creating it if needed.
+
+        The cart stays pinned in memory until release_cart() is called for it.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if session_id in self.carts:
+                self.hits += 1
+                cart = self.carts.pop(session_id)[0]
+            else:
+                self.misses += 1
+                cart = self._load(session_id)
+            self.carts[session_id] = (cart, now)  # Re-insert as the most recently used cart
+            self._pins[session_id] = self._pins.get(session_id, 0) + 1
+            self._evict_unpinned(now)
+            return cart
+
+    def release_cart(self, session_id):
+        """Tell the store a caller is done with a cart from get_cart(), so it may be evicted."""
+        with self._lock:
+            count = self._pins.get(session_id, 0) - 1
+            if count > 0:
+                self._pins[session_id] = count
+            else:
+                self._pins.pop(session_id, None)
+            self._evict_unpinned(time.monotonic())
+
+    def flush(self):
+        """Write every cart in memory to disk, e.g. before shutting down; pinned carts stay in memory."""
+        with self._lock:
+            for session_id, (cart, _) in list(self.carts.items()):
+                if session_id in self._pins:
+                    self._save(session_id, cart)
+                else:
+                    self._evict(session_id)
+
+    def stats(self):
+        """Return the cache counters and the number of carts in memory."""
+        return {'in_memory': len(self.carts), 'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+    def _evict_unpinned(self, now):
+        """Evict carts unused within the TTL, then the least recently used ones while over max_carts.
+
+        Pinned carts are skipped, so the store can hold more than max_carts
+        carts while callers keep that many pinned.
+        """
+        victims = []
+        excess = len(self.carts) - self.max_carts
+        for session_id, (cart, last_used) in self.carts.items():
+            expired = self.ttl is not None and now - last_used > self.ttl
+            if not expired and len(victims) >= excess:
+                break  # Later carts were used more recently
+            if session_id not in self._pins:
+                victims.append(session_id)
+        for session_id in victims:
+            self._evict(session_id)
+
+    def _evict(self, session_id):
+        """Move a cart from memory to disk."""
+        cart = self.carts.pop(session_id)[0]
+        self._save(session_id, cart)
+        self.evictions += 1
+
+    def _save(self, session_id, cart):
+        """Write a cart to disk in one step (an empty cart just removes its file)."""
+        path = self._path(session_id)
+        if cart.cart:
+            temp_path = path + '.tmp'
+            with open(temp_path, 'w') as file:
+                json.dump(cart.to_dict(), file, separators=(',', ':'))
+            os.replace(temp_path, path)  # A crash mid-write leaves the previous file intact
+        elif os.path.exists(path):
+            os.remove(path)
+
+    def _load(self, session_id):
+        """Read a cart from disk, or return a new empty cart if none was saved."""
+        try:
+            with open(self._path(session_id), 'r') as file:
+                return ShoppingCart.from_dict(json.load(file))
+        except FileNotFoundError:
+            return ShoppingCart()
+
+    def _path(self, session_id):
+        """Return the file used for a session, hashing the ID so any string is a safe name."""
+        return os.path.join(self.directory, hashlib.sha1(session_id.encode()).hexdigest() + '.json')
+
+
+def stress_test(worker_counts=(1, 2, 4, 8), operations=200000):
+    """Hammer one cart from several threads and check that the total stays exact."""
+    products = [(f"item{i}", 125 + i) for i in range(100)]  # (name, price in cents)
+    for workers in worker_counts:
+        cart = ShoppingCart()
+        per_worker = operations // workers
+
+        def work():
+            # Each worker adds two of every product it touches and then removes one
+            for i in range(per_worker):
+                name, price_cents = products[i % len(products)]
+                cart._add_line(name, price_cents, 2)
+                cart._remove_line(name, 1)
+
+        threads = [threading.Thread(target=work) for _ in range(workers)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        expected = sum(products[i % len(products)][1] for i in range(per_worker)) * workers
+        status = "exact" if cart.total_cents == expected else f"WRONG (expected {expected})"
+        print(f"{workers} workers: {per_worker * workers * 2 / elapsed:,.0f} updates/s, "
+              f"total {format_cents(cart.total_cents)} {status}")
 
 
 def main():
     """Main program loop for the shopping cart."""
-    shopping_cart = ShoppingCart()
+    cart_store = CartStore()
+    session_id = 'default'
+    shopping_cart = cart_store.get_cart(session_id)
 
     while True:
         print("\n--- Shopping Cart ---")
@@ -62,8 +284,9 @@ def main():
         print("2. Remove Product")
         print("3. Display Cart")
         print("4. Calculate Total Price")
-        print("5. Exit")
-        choice = input("Enter your choice (1-5): ")
+        print("5. Switch Session")
+        print("6. Exit")
+        choice = input(f"Enter your choice (1-6) [session: {session_id}]: ")
 
         if choice == '1':
             name = input("Enter product name: ")
@@ -85,6 +308,15 @@ def main():
             print(f"Total Price of items in the cart: ${total:.2f}")
 
         elif choice == '5':
+            cart_store.release_cart(session_id)  # Done with the old session's cart
+            session_id = input("Enter session ID: ") or 'default'
+            shopping_cart = cart_store.get_cart(session_id)
+            stats = cart_store.stats()
+            print(f"Switched to session '{session_id}'. Carts in memory: {stats['in_memory']}, "
+                  f"hits: {stats['hits']}, misses: {stats['misses']}, evictions: {stats['evictions']}")
+
+        elif choice == '6':
+            cart_store.flush()  # Keep every cart on disk for the next run
             print("Exiting Shopping Cart. Goodbye!")
             break
 
@@ -93,4 +325,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if "--stress" in sys.argv:
+        stress_test()
+    else:
+        main()
@@ -1,3 +1,46 @@
+import bisect
+import csv
+import json
+import math
+import mmap
+import os
+import re
+from array import array
+from heapq import merge
+from itertools import islice
+from operator import neg
+
+# Files of the columnar on-disk format, one column per file
+GENRES_FILE = 'genres.json'  # Genre names; each movie stores an index into this list
+GENRE_CODES_FILE = 'genre_codes.bin'  # uint16 genre index per movie
+RATINGS_FILE = 'ratings.bin'  # float32 rating per movie
+TITLE_OFFSETS_FILE = 'title_offsets.bin'  # uint64 start of each title in the blob, plus its end
+TITLES_FILE = 'titles.bin'  # All titles, UTF-8 encoded, back to back
+
+TOKEN_PATTERN = re.compile(r"\w+")  # Words that make up a title for searching
+
+
+def token_grams(token):
+    """Return the trigrams of a word, padded so its first and last letters count too."""
+    padded = f"^{token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b, limit):
+    """Return the Levenshtein distance between two words, or limit + 1 once it is known to exceed limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1  # Every later row is at least as large
+        previous = current
+    return previous[-1]
+
+
 class Movie:
     def __init__(self, title, genre, rating):
         """Initialize a movie with a title, genre, and rating."""
@@ -10,33 +53,239 @@ class Movie:
         return f"'{self.title}' - Genre: {self.genre}, Rating: {self.rating}"
 
 
+class RatingIndex:
+    def __init__(self):
+        """Initialize an empty list of movies kept in descending order of rating."""
+        self._keys = []  # Negated ratings, ascending, so bisect keeps the best movies first
+        self._movies = []  # Movies in the same order as their keys
+
+    def add(self, movie):
+        """Insert a movie at its place in the rating order (after movies with the same rating)."""
+        position = bisect.bisect_right(self._keys, -movie.rating)
+        self._keys.insert(position, -movie.rating)
+        self._movies.insert(position, movie)
+
+    def add_many(self, movies):
+        """Insert many movies with one sort instead of one insertion each."""
+        self._movies = sorted(self._movies + list(movies), key=lambda movie: -movie.rating)  # Stable sort
+        self._keys = [-movie.rating for movie in self._movies]
+
+    def iter_range(self, min_rating=None, max_rating=None):
+        """Lazily yield movies rated between min_rating and max_rating (inclusive), best first."""
+        start = bisect.bisect_left(self._keys, -max_rating) if max_rating is not None else 0
+        end = bisect.bisect_right(self._keys, -min_rating) if min_rating is not None else len(self._keys)
+        for position in range(start, end):
+            yield self._movies[position]
+
+    def __iter__(self):
+        """Iterate over the movies from the highest rating to the lowest."""
+        return iter(self._movies)
+
+    def __len__(self):
+        """Return the number of movies in the index."""
+        return len(self._movies)
+
+
 class MovieDatabase:
     def __init__(self):
         """Initialize an empty movie database and a set for unique genres."""
+        self._clear()
+
+    def _clear(self):
+        """Remove every movie and reset the indexes."""
         self.movies = []  # List to hold movie objects
         self.genres = set()  # Set to hold unique genres
+        self.movies_by_genre = {}  # Lowercase genre -> RatingIndex of the movies in that genre
+        self.by_rating = RatingIndex()  # All movies, highest rating first
+
+        # Title search indexes; movies are referred to by their position in self.movies
+        self.title_tokens = {}  # Word -> positions of the movies whose title contains it
+        self._vocabulary = []  # Sorted list of every title word, for prefix matches
+        self._token_grams = {}  # Trigram -> title words containing it, for typo-tolerant matches
+        self._titles = []  # Sorted (lowercase title, position) pairs, for autocomplete
 
     def add_movie(self, movie):
         """Add a movie to the database and its genre to the set of unique genres."""
         self.movies.append(movie)  # Add movie to the list
         self.genres.add(movie.genre)  # Add genre to the set
+        self.movies_by_genre.setdefault(movie.genre.lower(), RatingIndex()).add(movie)  # Index by genre
+        self.by_rating.add(movie)  # Keep the rating order up to date
+        self._index_titles(len(self.movies) - 1)
         print(f"Added movie: {movie}")
 
+    def add_movies(self, movies):
+        """Add many movies at once, updating each index in a single pass."""
+        movies = list(movies)
+        by_genre = {}
+        for movie in movies:
+            self.genres.add(movie.genre)
+            by_genre.setdefault(movie.genre.lower(), []).append(movie)
+        first = len(self.movies)
+        self.movies.extend(movies)
+        self._index_titles(first)
+        for genre, genre_movies in by_genre.items():
+            self.movies_by_genre.setdefault(genre, RatingIndex()).add_many(genre_movies)
+        self.by_rating.add_many(movies)
+        print(f"Added {len(movies)} movies.")
+
+    def import_movies(self, filename):
+        """Add the movies in a CSV or JSON Lines feed, skipping and counting malformed rows."""
+        movies = []
+        invalid = 0
+        for movie in read_movie_feed(filename):
+            if movie is None:
+                invalid += 1
+            else:
+                movies.append(movie)
+        self.add_movies(movies)
+        if invalid:
+            print(f"Skipped {invalid} invalid rows.")
+
+    def save(self, directory):
+        """Save all movies to a directory in the columnar format, highest rating first."""
+        save_columnar(self.by_rating, directory)
+        print(f"Saved {len(self.by_rating)} movies to '{directory}'.")
+
+    def load(self, directory):
+        """Replace the movies in the database with those stored in a columnar directory.
+
+        Every movie is read into memory and indexed, so loading is not near-instant
+        and its memory grows with the catalogue. For rating queries on a large saved
+        catalogue, open it with ColumnarMovies instead: its top_k() and
+        movies_in_rating_range() run straight off the memory-mapped columns, so
+        opening is near-instant and only the movies returned are read.
+        """
+        columns = ColumnarMovies(directory)  # Opened first, so a missing directory keeps the current movies
+        try:
+            self._clear()
+            self.add_movies(columns)
+        finally:
+            columns.close()
+
+    def _index_titles(self, first):
+        """Add the titles of self.movies[first:] to the title search indexes."""
+        new_titles = []
+        new_tokens = []
+        for position in range(first, len(self.movies)):
+            title = self.movies[position].title.lower()
+            new_titles.append((title, position))
+            for token in set(TOKEN_PATTERN.findall(title)):
+                if token not in self.title_tokens:
+                    self.title_tokens[token] = []
+                    new_tokens.append(token)
+                    for gram in token_grams(token):
+                        self._token_grams.setdefault(gram, set()).add(token)
+                self.title_tokens[token].append(position)
+
+        # Insert single items in place; merge larger batches in one pass
+        for index, new_items in (('_titles', new_titles), ('_vocabulary', new_tokens)):
+            if len(new_items) == 1:
+                bisect.insort(getattr(self, index), new_items[0])
+            elif new_items:
+                setattr(self, index, list(merge(getattr(self, index), sorted(new_items))))
+
+    def autocomplete(self, prefix, limit=10):
+        """Return up to limit movies whose title starts with prefix, in title order.
+
+        Only the first limit matching titles are read, so the cost does not grow
+        with the number of titles sharing a short prefix.
+        """
+        prefix = prefix.lower()
+        matches = []
+        for position in range(bisect.bisect_left(self._titles, (prefix,)), len(self._titles)):
+            title, movie_position = self._titles[position]
+            if len(matches) == limit or not title.startswith(prefix):
+                break  # Titles sharing the prefix are adjacent in the sorted list
+            matches.append(self.movies[movie_position])
+        return matches
+
+    def search_titles(self, query, limit=10):
+        """Return up to limit movies whose title matches every word of the query.
+
+        A word matches exactly, as a prefix of a title word, or with a small
+        number of typos. Results are ranked by match quality, then by rating.
+        """
+        query = query.lower()
+        scores = None  # Movie position -> total match score (lower is better)
+        for word in TOKEN_PATTERN.findall(query):
+            word_scores = {}
+            for token, score in self._match_word(word).items():
+                for position in self.title_tokens[token]:
+                    if score < word_scores.get(position, score + 1):
+                        word_scores[position] = score
+            if scores is None:
+                scores = word_scores
+            else:  # Every query word has to match
+                scores = {position: scores[position] + score for position, score in word_scores.items() if position in scores}
+        if not scores:
+            return []
+
+        def rank(position):
+            exact_title = self.movies[position].title.lower() == query
+            return (not exact_title, scores[position], -self.movies[position].rating)
+
+        return [self.movies[position] for position in sorted(scores, key=rank)[:limit]]
+
+    def _match_word(self, word):
+        """Return the title words matching a query word, with a score: 0 exact, 1 prefix, 2+ typos."""
+        matches = {}
+        # Prefix matches are adjacent in the sorted vocabulary (this includes an exact match)
+        for position in range(bisect.bisect_left(self._vocabulary, word), len(self._vocabulary)):
+            token = self._vocabulary[position]
+            if not token.startswith(word):
+                break
+            matches[token] = 0 if token == word else 1
+
+        # Each typo changes at most 3 trigrams, so close words must share the rest
+        max_typos = 1 if len(word) < 8 else 2
+        grams = token_grams(word)
+        needed = len(grams) - 3 * max_typos
+        if needed < 1:
+            return matches  # Too short for typo-tolerant matching
+        shared = {}
+        for gram in grams:
+            for token in self._token_grams.get(gram, ()):
+                shared[token] = shared.get(token, 0) + 1
+        for token, count in shared.items():
+            if count >= needed and token not in matches:
+                distance = edit_distance(word, token, max_typos)
+                if distance <= max_typos:
+                    matches[token] = 1 + distance
+        return matches
+
+    def display_title_search(self, query):
+        """Search movies by title and display the best matches."""
+        print(f"\nMovies matching '{query}':")
+        found_movies = self.search_titles(query)
+        if found_movies:
+            for movie in found_movies:
+                print(movie)
+        else:
+            print(f"No movies found matching '{query}'.")
+
     def search_by_genre(self, genre):
         """Search and display movies by a specific genre."""
         print(f"\nMovies in genre '{genre}':")
-        found_movies = [movie for movie in self.movies if movie.genre.lower() == genre.lower()]
+        found_movies = self.movies_by_genre.get(genre.lower())  # Listed highest rating first
         if found_movies:
             for movie in found_movies:
                 print(movie)
         else:
             print(f"No movies found in the genre '{genre}'.")
 
+    def top_k(self, k, genre=None, min_rating=None):
+        """Lazily yield the k highest-rated movies, optionally in one genre and rated at least min_rating."""
+        return islice(self.movies_in_rating_range(min_rating, None, genre), k)
+
+    def movies_in_rating_range(self, min_rating=None, max_rating=None, genre=None):
+        """Lazily yield movies rated between min_rating and max_rating (inclusive), best first."""
+        index = self.by_rating if genre is None else self.movies_by_genre.get(genre.lower(), RatingIndex())
+        return index.iter_range(min_rating, max_rating)
+
     def display_movies_sorted_by_rating(self):
         """Display all movies sorted by their rating in descending order."""
         print("\nMovies sorted by rating:")
-        sorted_movies = sorted(self.movies, key=lambda x: x.rating, reverse=True)  # Sort movies by rating
-        for movie in sorted_movies:
+        for movie in self.by_rating:  # Already kept in rating order
             print(movie)
 
     def display_unique_genres(self):
@@ -49,6 +298,121 @@ class MovieDatabase:
             print("No genres available.")
 
 
+def save_columnar(movies, directory):
+    """Write movies to a directory as separate genre, rating and title columns."""
+    os.makedirs(directory, exist_ok=True)
+    genre_codes = {}  # Genre -> index in the genre list
+    codes = array('H')
+    ratings = array('f')
+    offsets = array('Q', [0])
+    with open(os.path.join(directory, TITLES_FILE), 'wb') as titles:
+        for movie in movies:
+            codes.append(genre_codes.setdefault(movie.genre, len(genre_codes)))
+            ratings.append(movie.rating)
+            offsets.append(offsets[-1] + titles.write(movie.title.encode()))
+
+    with open(os.path.join(directory, GENRES_FILE), 'w') as file:
+        json.dump(list(genre_codes), file)
+    for name, column in ((GENRE_CODES_FILE, codes), (RATINGS_FILE, ratings), (TITLE_OFFSETS_FILE, offsets)):
+        with open(os.path.join(directory, name), 'wb') as file:
+            column.tofile(file)
+
+
+class ColumnarMovies:
+    def __init__(self, directory):
+        """Open a columnar movie directory by memory-mapping its columns (nothing is read up front)."""
+        with open(os.path.join(directory, GENRES_FILE), 'r') as file:
+            self.genres = json.load(file)
+        self._maps = []
+        self._codes = self._map(directory, GENRE_CODES_FILE, 'H')
+        self._ratings = self._map(directory, RATINGS_FILE, 'f')
+        self._offsets = self._map(directory, TITLE_OFFSETS_FILE, 'Q')
+        self._titles = self._map(directory, TITLES_FILE, 'B')
+
+    def _map(self, directory, name, typecode):
+        """Memory-map one column file and view it as an array of the given type."""
+        with open(os.path.join(directory, name), 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return memoryview(array(typecode))  # Empty files cannot be memory-mapped
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(data)
+        return memoryview(data).cast(typecode)
+
+    def __len__(self):
+        """Return the number of stored movies."""
+        return len(self._ratings)
+
+    def __getitem__(self, position):
+        """Build the Movie stored at a position (0 is the highest rated)."""
+        if not 0 <= position < len(self):
+            raise IndexError('movie position out of range')
+        title = bytes(self._titles[self._offsets[position]:self._offsets[position + 1]]).decode()
+        rating = float(f"{self._ratings[position]:.7g}")  # Undo float32 noise, e.g. 8.300000190734863 -> 8.3
+        return Movie(title, self.genres[self._codes[position]], rating)
+
+    def __iter__(self):
+        """Iterate over the stored movies from the highest rating to the lowest."""
+        return (self[position] for position in range(len(self)))
+
+    def top_k(self, k, genre=None, min_rating=None):
+        """Lazily yield the k highest-rated movies, like MovieDatabase.top_k but straight from the columns."""
+        return islice(self.movies_in_rating_range(min_rating, None, genre), k)
+
+    def movies_in_rating_range(self, min_rating=None, max_rating=None, genre=None):
+        """Lazily yield movies rated between min_rating and max_rating (inclusive), best first.
+
+        The rating column is stored highest first, so the range is found by binary
+        search; only the movies yielded (and, with a genre, the codes skipped over)
+        are read from disk.
+        """
+        def as_stored(rating):
+            return array('f', [rating])[0]  # Round like the float32 column, so 8.3 matches a stored 8.3
+
+        ratings = self._ratings
+        start = bisect.bisect_left(ratings, -as_stored(max_rating), key=neg) if max_rating is not None else 0
+        end = bisect.bisect_right(ratings, -as_stored(min_rating), key=neg) if min_rating is not None else len(ratings)
+        codes = None if genre is None else {code for code, name in enumerate(self.genres) if name.lower() == genre.lower()}
+        for position in range(start, end):
+            if codes is None or self._codes[position] in codes:
+                yield self[position]
+
+    def close(self):
+        """Release the memory maps."""
+        for view in (self._codes, self._ratings, self._offsets, self._titles):
+            view.release()
+        for data in self._maps:
+            data.close()
+
+
+def read_movie_feed(filename):
+    """Yield movies from a CSV file (with a title,genre,rating header) or a JSON Lines file.
+
+    Yields None in place of a row that is not valid JSON, is missing a field or has a bad rating.
+    """
+    with open(filename, 'r', newline='') as file:
+        if filename.endswith('.jsonl'):
+            for line in file:
+                if line.strip():
+                    try:
+                        yield movie_from_record(json.loads(line))
+                    except json.JSONDecodeError:
+                        yield None
+        else:
+            for row in csv.DictReader(file):
+                yield movie_from_record(row)
+
+
+def movie_from_record(record):
+    """Build a movie from a feed record, or return None if a field is missing or the rating is not a number."""
+    try:
+        title, genre, rating = record['title'], record['genre'], float(record['rating'])
+    except (KeyError, TypeError, ValueError):  # Missing field, non-object JSON, or a rating like 'good'
+        return None
+    if title is None or genre is None or not math.isfinite(rating):  # Short CSV row, or NaN/inf
+        return None
+    return Movie(str(title), str(genre), rating)
+
+
 def main():
     """Main program loop for the movie database."""
     movie_database = MovieDatabase()
@@ -59,8 +423,13 @@ def main():
         print("2. Search by Genre")
         print("3. Display All Movies Sorted by Rating")
         print("4. Display Unique Genres")
-        print("5. Exit")
-        choice = input("Enter your choice (1-5): ")
+        print("5. Show Top Rated Movies")
+        print("6. Import Movies from File")
+        print("7. Save Database")
+        print("8. Load Database")
+        print("9. Search by Title")
+        print("10. Exit")
+        choice = input("Enter your choice (1-10): ")
 
         if choice == '1':
             title = input("Enter movie title: ")
@@ -80,6 +449,39 @@ def main():
             movie_database.display_unique_genres()
 
         elif choice == '5':
+            k = int(input("How many movies to show: "))
+            genre = input("Genre (leave blank for all): ") or None
+            min_rating = input("Minimum rating (leave blank for none): ")
+            min_rating = float(min_rating) if min_rating else None
+            print(f"\nTop {k} movies:")
+            for movie in movie_database.top_k(k, genre, min_rating):
+                print(movie)
+
+        elif choice == '6':
+            filename = input("Enter the file to import (.csv or .jsonl): ")
+            try:
+                movie_database.import_movies(filename)
+            except FileNotFoundError:
+                print(f"File '{filename}' not found.")
+            except (csv.Error, UnicodeDecodeError) as error:
+                print(f"Could not read '{filename}': {error}")
+
+        elif choice == '7':
+            directory = input("Enter the directory to save to (default: movies_db): ") or 'movies_db'
+            movie_database.save(directory)
+
+        elif choice == '8':
+            directory = input("Enter the directory to load from (default: movies_db): ") or 'movies_db'
+            try:
+                movie_database.load(directory)
+            except FileNotFoundError:
+                print(f"No saved database found in '{directory}'.")
+
+        elif choice == '9':
+            query = input("Enter title to search: ")
+            movie_database.display_title_search(query)
+
+        elif choice == '10':
             print("Exiting Movie Database. Goodbye!")
             break
 
@@ -1,3 +1,21 @@
+import os
+import re
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+CHUNK_SIZE = 1024 * 1024  # Bytes read from the file at a time by validate_file
+RANGE_SIZE = 64 * 1024 * 1024  # Bytes of the file summarized by each parallel task
+
+# Lookup tables built once: each opening bracket maps to the closing one it expects
+CLOSING_FOR = {'(': ')', '[': ']', '{': '}'}
+OPENING_BRACKETS = set(CLOSING_FOR)
+CLOSING_BRACKETS = set(CLOSING_FOR.values())
+CLOSING_BYTE_FOR = {ord(opening): ord(closing) for opening, closing in CLOSING_FOR.items()}
+
+BRACKETS = re.compile(rb"[()\[\]{}]")  # Lets the scan skip everything that is not a bracket
+
+
 class Stack:
     def __init__(self):
         """Initialize an empty stack."""
@@ -33,18 +51,179 @@ class Stack:
 def is_balanced_parentheses(s):
     """Check if the parentheses in the string are balanced."""
     stack = Stack()  # Create a new stack to hold the opening parentheses
-    # Mapping of closing parentheses to their corresponding opening ones
-    parentheses_map = {')': '(', '}': '{', ']': '['}
 
     for char in s:
-        if char in parentheses_map.values():  # If it is an opening parenthesis
+        if char in OPENING_BRACKETS:  # If it is an opening parenthesis
             stack.push(char)  # Push it onto the stack
-        elif char in parentheses_map.keys():  # If it is a closing parenthesis
-            if stack.is_empty() or stack.pop() != parentheses_map[char]:
+        elif char in CLOSING_BRACKETS:  # If it is a closing parenthesis
+            if stack.is_empty() or CLOSING_FOR[stack.pop()] != char:
                 return False  # Unmatched closing parenthesis
     return stack.is_empty()  # Return True if no unmatched opening parentheses remain
 
 
+def validate_stream(chunks):
+    """Check the brackets in a stream of chunks without holding the whole input in memory.
+
+    Args:
+        chunks: An iterable of bytes (or str, which is UTF-8 encoded) pieces of the input.
+
+    Returns:
+        None if the brackets are balanced, otherwise the byte offset of the first error:
+        the first closing bracket that does not match, or the earliest opening bracket
+        that is never closed.
+    """
+    expected = bytearray()  # Closing bracket each open bracket is waiting for, one byte per level
+    opened_at = array('q')  # Byte offset of each open bracket, kept in step with expected
+    offset = 0  # Byte offset of the start of the current chunk
+
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        for match in BRACKETS.finditer(chunk):
+            position = match.start()
+            byte = chunk[position]
+            closing = CLOSING_BYTE_FOR.get(byte)
+            if closing is not None:  # Opening bracket
+                expected.append(closing)
+                opened_at.append(offset + position)
+            elif expected and expected[-1] == byte:  # Closing bracket that matches
+                expected.pop()
+                opened_at.pop()
+            else:
+                return offset + position  # Closing bracket with no matching opening one
+        offset += len(chunk)
+
+    return opened_at[0] if opened_at else None  # Outermost bracket left open, if any
+
+
+def validate_file(path, chunk_size=CHUNK_SIZE):
+    """Check the brackets in a file, reading it chunk_size bytes at a time.
+
+    Returns:
+        None if the brackets are balanced, otherwise the byte offset of the first error.
+    """
+    with open(path, 'rb') as file:
+        return validate_stream(iter(lambda: file.read(chunk_size), b''))
+
+
+def summarize_range(path, start, end, chunk_size=CHUNK_SIZE):
+    """Reduce the bytes start..end of a file to a summary that can be combined with its neighbours.
+
+    Brackets are single ASCII bytes, which never occur inside a multi-byte UTF-8
+    character, so any byte offset is a safe place to split the file.
+
+    Returns:
+        A tuple (error_offset, closers, openers). error_offset is the offset of a
+        closing bracket that mismatches an opening one inside the range, or None.
+        closers holds the closing brackets left for earlier ranges to match, and
+        openers the opening brackets left for later ranges to close, each as a
+        (bytearray of closing brackets, array of offsets) pair.
+    """
+    expected, opened_at = bytearray(), array('q')
+    unmatched, unmatched_at = bytearray(), array('q')
+    offset = start
+
+    with open(path, 'rb') as file:
+        file.seek(start)
+        while offset < end:
+            chunk = file.read(min(chunk_size, end - offset))
+            if not chunk:
+                break
+            for match in BRACKETS.finditer(chunk):
+                position = match.start()
+                byte = chunk[position]
+                closing = CLOSING_BYTE_FOR.get(byte)
+                if closing is not None:  # Opening bracket
+                    expected.append(closing)
+                    opened_at.append(offset + position)
+                elif not expected and start > 0:  # Closing bracket for an earlier range to match
+                    unmatched.append(byte)
+                    unmatched_at.append(offset + position)
+                elif expected and expected[-1] == byte:  # Closing bracket that matches
+                    expected.pop()
+                    opened_at.pop()
+                else:  # Mismatch, or a closing bracket before any opening one in the file
+                    return offset + position, (unmatched, unmatched_at), (expected, opened_at)
+            offset += len(chunk)
+
+    return None, (unmatched, unmatched_at), (expected, opened_at)
+
+
+def combine_summaries(left, right):
+    """Combine the summaries of two neighbouring ranges into the summary of both.
+
+    The operation is associative, so summaries can be combined in any grouping as
+    long as their order is kept. The left summary is updated in place.
+    """
+    error_offset, closers, (expected, opened_at) = left
+    if error_offset is not None:
+        return left  # Nothing after the first error can change the result
+
+    right_error, (right_closers, right_closers_at), right_openers = right
+    for byte, position in zip(right_closers, right_closers_at):
+        if not expected:  # Still unmatched, left for ranges further left
+            closers[0].append(byte)
+            closers[1].append(position)
+        elif expected[-1] == byte:
+            expected.pop()
+            opened_at.pop()
+        else:
+            return position, closers, (expected, opened_at)
+
+    if right_error is not None:
+        return right_error, closers, (expected, opened_at)
+    expected.extend(right_openers[0])
+    opened_at.extend(right_openers[1])
+    return None, closers, (expected, opened_at)
+
+
+def first_error(summary):
+    """Return the byte offset of the first error described by a summary of a whole input, or None."""
+    error_offset, (_, closers_at), (_, opened_at) = summary
+    if closers_at:
+        return closers_at[0]  # Closing bracket with nothing before it to match
+    if error_offset is not None:
+        return error_offset
+    return opened_at[0] if opened_at else None  # Outermost bracket left open, if any
+
+
+def validate_file_parallel(path, workers=None, range_size=RANGE_SIZE):
+    """Check the brackets in a file by summarizing byte ranges of it on a process pool.
+
+    Gives the same result as validate_file, which is used directly for files no
+    larger than one range.
+
+    Returns:
+        None if the brackets are balanced, otherwise the byte offset of the first error.
+    """
+    size = os.path.getsize(path)
+    if size <= range_size:
+        return validate_file(path)
+
+    starts = range(0, size, range_size)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(summarize_range, path, start, min(start + range_size, size))
+                   for start in starts]
+        summary = futures[0].result()
+        for future in futures[1:]:
+            if summary[0] is not None:  # The first error is already known
+                for pending in futures:
+                    pending.cancel()
+                break
+            summary = combine_summaries(summary, future.result())
+
+    return first_error(summary)
+
+
+def report_file(path, parallel=False):
+    """Print whether the brackets in a file are balanced and where the first error is."""
+    error_offset = validate_file_parallel(path) if parallel else validate_file(path)
+    if error_offset is None:
+        print(f"{path}: the brackets are balanced.")
+    else:
+        print(f"{path}: the brackets are not balanced, first error at byte {error_offset}.")
+
+
 def main():
     """Main program loop to check for balanced parentheses."""
     while True:
@@ -59,4 +238,9 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    file_paths = [arg for arg in sys.argv[1:] if arg != "--parallel"]
+    if file_paths:
+        for file_path in file_paths:  # python main.py [--parallel] FILE... validates files instead
+            report_file(file_path, parallel="--parallel" in sys.argv)
+    else:
+        main()